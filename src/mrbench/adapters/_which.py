@@ -0,0 +1,32 @@
+"""Process-wide cache of PATH lookups for adapter binaries."""
+
+from __future__ import annotations
+
+import functools
+import os
+import shutil
+
+
+@functools.cache
+def _which(name: str, path: str | None) -> str | None:
+    return shutil.which(name, path=path)
+
+
+def cached_which(name: str) -> str | None:
+    """Resolve a binary on PATH, walking each PATH value at most once per name.
+
+    The current ``PATH`` is part of the cache key, so changing it still
+    triggers a fresh lookup.
+
+    Args:
+        name: Binary name to look up.
+
+    Returns:
+        Absolute path to the binary, or None if it is not on PATH.
+    """
+    return _which(name, os.environ.get("PATH"))
+
+
+def clear_which_cache() -> None:
+    """Forget all cached lookups, e.g. after binaries were installed."""
+    _which.cache_clear()
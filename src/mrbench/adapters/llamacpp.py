@@ -5,9 +5,9 @@ Wraps the llama.cpp CLI (llama-cli or main binary).
 
 from __future__ import annotations
 
-import shutil
 from pathlib import Path
 
+from mrbench.adapters._which import cached_which
 from mrbench.adapters.base import (
     Adapter,
     AdapterCapabilities,
@@ -39,7 +39,7 @@ class LlamaCppAdapter(Adapter):
             return self._binary_path
         # Try multiple binary names
         for name in ["llama-cli", "llama-server", "main"]:
-            binary = shutil.which(name)
+            binary = cached_which(name)
             if binary:
                 return binary
         return None
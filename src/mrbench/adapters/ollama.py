@@ -5,8 +5,7 @@ Wraps the Ollama CLI for local model inference.
 
 from __future__ import annotations
 
-import shutil
-
+from mrbench.adapters._which import cached_which
 from mrbench.adapters.base import (
     Adapter,
     AdapterCapabilities,
@@ -46,7 +45,7 @@ class OllamaAdapter(Adapter):
             return self._binary_path
         if self._cached_binary:
             return self._cached_binary
-        self._cached_binary = shutil.which("ollama")
+        self._cached_binary = cached_which("ollama")
         return self._cached_binary
 
     def _run_command(self, args: list[str], stdin: str | None = None) -> ExecutorResult:
@@ -114,15 +113,13 @@ class OllamaAdapter(Adapter):
             return []
 
         models: list[str] = []
-        lines = result.stdout.strip().split("\n")
-
-        # Skip header line
-        for line in lines[1:]:
-            if line.strip():
-                # First column is the model name
-                parts = line.split()
-                if parts:
-                    models.append(parts[0])
+
+        # Skip header line; the first column is the model name, so only
+        # that field is split off rather than tokenizing the whole row.
+        for line in result.stdout.lstrip().splitlines()[1:]:
+            parts = line.split(None, 1)
+            if parts:
+                models.append(parts[0])
 
         return models
 
@@ -7,6 +7,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from mrbench.adapters._which import clear_which_cache
+
 if TYPE_CHECKING:
     from mrbench.adapters.base import Adapter, DetectionResult
 
@@ -132,6 +134,7 @@ def get_default_registry() -> AdapterRegistry:
 
 
 def reset_default_registry() -> None:
-    """Reset the default registry (useful for testing)."""
+    """Reset the default registry and cached binary lookups (useful for testing)."""
     global _default_registry
     _default_registry = None
+    clear_which_cache()
@@ -5,8 +5,7 @@ Wraps the vLLM CLI for running local LLM inference.
 
 from __future__ import annotations
 
-import shutil
-
+from mrbench.adapters._which import cached_which
 from mrbench.adapters.base import (
     Adapter,
     AdapterCapabilities,
@@ -36,7 +35,7 @@ class VllmAdapter(Adapter):
     def _get_binary(self) -> str | None:
         if self._binary_path:
             return self._binary_path
-        return shutil.which("vllm")
+        return cached_which("vllm")
 
     def detect(self) -> DetectionResult:
         binary = self._get_binary()
@@ -2,12 +2,37 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import sys
+from pathlib import Path
 from typing import Any
 
 
+@functools.cache
+def _orjson() -> Any:
+    """Return the ``orjson`` module if installed, else None."""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def _dumps_bytes(data: Any) -> bytes:
+    """Serialize ``data`` as indented JSON, using orjson when it is installed."""
+    orjson = _orjson()
+    if orjson is not None:
+        return bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    return json.dumps(data, indent=2).encode()
+
+
 def emit_json(data: Any) -> None:
     """Emit strict JSON to stdout without Rich wrapping effects."""
-    json.dump(data, sys.stdout, indent=2)
+    sys.stdout.write(_dumps_bytes(data).decode())
     sys.stdout.write("\n")
+
+
+def write_json_file(path: Path, data: Any) -> None:
+    """Write ``data`` to ``path`` as indented JSON."""
+    path.write_bytes(_dumps_bytes(data))
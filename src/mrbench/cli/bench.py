@@ -5,21 +5,20 @@ Runs benchmark suite across providers.
 
 from __future__ import annotations
 
-import json
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Annotated, Any
 
 import typer
-import yaml
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from mrbench.adapters.base import RunOptions, RunResult
 from mrbench.adapters.registry import get_default_registry
-from mrbench.cli._output import emit_json
+from mrbench.cli._output import emit_json, write_json_file
+from mrbench.core.benchmark import load_suite
 from mrbench.core.redaction import redact_for_storage
-from mrbench.core.storage import Storage, hash_prompt
+from mrbench.core.storage import MetricRow, Storage, hash_prompt
 
 console = Console()
 
@@ -158,8 +157,7 @@ def bench_command(
         raise typer.Exit(1)
 
     # Load suite
-    with open(suite) as f:
-        suite_data = yaml.safe_load(f)
+    suite_data = load_suite(suite)
 
     if not isinstance(suite_data, dict):
         console.print("[red]Invalid suite format: expected mapping at document root[/red]")
@@ -253,17 +251,17 @@ def bench_command(
                     )
 
                     # Create job in storage
-                    job = storage.create_job(
-                        run_id=run.id,
-                        provider=adapter.name,
-                        model=primary_model,
-                        prompt_hash=hash_prompt(prompt_text),
-                        prompt_preview=(
-                            redact_for_storage(prompt_text[:100]) if store_prompts else None
-                        ),
-                    )
-
-                    storage.start_job(job.id)
+                    with storage.transaction():
+                        job = storage.create_job(
+                            run_id=run.id,
+                            provider=adapter.name,
+                            model=primary_model,
+                            prompt_hash=hash_prompt(prompt_text),
+                            prompt_preview=(
+                                redact_for_storage(prompt_text[:100]) if store_prompts else None
+                            ),
+                        )
+                        storage.start_job(job.id)
 
                     result, resolved_model, fallback_used = _run_prompt_with_fallback(
                         adapter=adapter,
@@ -271,54 +269,58 @@ def bench_command(
                         candidate_models=candidate_models,
                     )
 
-                    if resolved_model != primary_model:
-                        storage.set_job_model(job.id, resolved_model)
-
-                    storage.complete_job(
-                        job.id,
-                        exit_code=result.exit_code,
-                        error_message=result.error,
-                    )
+                    with storage.transaction():
+                        if resolved_model != primary_model:
+                            storage.set_job_model(job.id, resolved_model)
 
-                    # Add metrics
-                    storage.add_metric(job.id, "wall_time_ms", result.wall_time_ms, "ms")
-                    if result.ttft_ms is not None:
-                        storage.add_metric(job.id, "ttft_ms", result.ttft_ms, "ms")
-                    if result.token_count_input is not None:
-                        storage.add_metric(
+                        storage.complete_job(
                             job.id,
-                            "input_tokens",
-                            result.token_count_input,
-                            "tokens",
-                            is_estimated=result.tokens_estimated,
+                            exit_code=result.exit_code,
+                            error_message=result.error,
                         )
-                    if result.token_count_output is not None:
-                        storage.add_metric(
-                            job.id,
-                            "output_tokens",
-                            result.token_count_output,
-                            "tokens",
-                            is_estimated=result.tokens_estimated,
-                        )
-                    if (
-                        result.token_count_input is not None
-                        or result.token_count_output is not None
-                    ):
-                        input_tokens = result.token_count_input or 0
-                        output_tokens = result.token_count_output or 0
-                        storage.add_metric(
-                            job.id,
-                            "total_tokens",
-                            input_tokens + output_tokens,
-                            "tokens",
-                            is_estimated=result.tokens_estimated,
+
+                        # Add metrics
+                        metrics: list[MetricRow] = [
+                            ("wall_time_ms", result.wall_time_ms, "ms", False)
+                        ]
+                        if result.ttft_ms is not None:
+                            metrics.append(("ttft_ms", result.ttft_ms, "ms", False))
+                        if result.token_count_input is not None:
+                            metrics.append(
+                                (
+                                    "input_tokens",
+                                    result.token_count_input,
+                                    "tokens",
+                                    result.tokens_estimated,
+                                )
+                            )
+                        if result.token_count_output is not None:
+                            metrics.append(
+                                (
+                                    "output_tokens",
+                                    result.token_count_output,
+                                    "tokens",
+                                    result.tokens_estimated,
+                                )
+                            )
+                        if (
+                            result.token_count_input is not None
+                            or result.token_count_output is not None
+                        ):
+                            input_tokens = result.token_count_input or 0
+                            output_tokens = result.token_count_output or 0
+                            metrics.append(
+                                (
+                                    "total_tokens",
+                                    input_tokens + output_tokens,
+                                    "tokens",
+                                    result.tokens_estimated,
+                                )
+                            )
+                        metrics.append(
+                            ("fallback_used", 1.0 if fallback_used else 0.0, "ratio", False)
                         )
-                    storage.add_metric(
-                        job.id,
-                        "fallback_used",
-                        1.0 if fallback_used else 0.0,
-                        "ratio",
-                    )
+                        storage.add_metrics(job.id, metrics)
 
                     # Write job output
                     job_file = jobs_dir / f"{job.id}.json"
@@ -344,8 +346,7 @@ def bench_command(
                         "output_length": len(result.output),
                         "error": result.error,
                     }
-                    with open(job_file, "w") as f:
-                        json.dump(job_data, f, indent=2)
+                    write_json_file(job_file, job_data)
 
                     # Store prompt if requested
                     if store_prompts:
@@ -366,8 +367,7 @@ def bench_command(
 
     # Write run metadata
     meta_file = run_dir / "run_meta.json"
-    with open(meta_file, "w") as f:
-        json.dump(results, f, indent=2)
+    write_json_file(meta_file, results)
 
     if json_output:
         emit_json({"run_id": run.id, "output_dir": str(run_dir)})
@@ -5,7 +5,6 @@ Runs discovery and records capability snapshot.
 
 from __future__ import annotations
 
-import json
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Annotated, Any
@@ -14,7 +13,7 @@ import typer
 from rich.console import Console
 
 from mrbench.adapters.registry import get_default_registry
-from mrbench.cli._output import emit_json
+from mrbench.cli._output import emit_json, write_json_file
 from mrbench.core.config import get_default_data_path
 
 console = Console()
@@ -81,8 +80,7 @@ def detect_command(
         cache_dir.mkdir(parents=True, exist_ok=True)
         cache_file = cache_dir / "capabilities.json"
 
-        with open(cache_file, "w") as f:
-            json.dump(results, f, indent=2)
+        write_json_file(cache_file, results)
 
         if not json_output:
             console.print(f"[green]✓ Wrote capabilities to {cache_file}[/green]")
@@ -322,22 +322,16 @@ def report_command(
             console.print(f"[red]Run not found: {run_id}[/red]")
             raise typer.Exit(1)
 
-        # Get jobs
-        jobs = storage.get_jobs_for_run(run_id)
+        # Get jobs with their metrics
+        jobs = storage.get_jobs_with_metrics(run_id)
 
         if not jobs:
             console.print("[yellow]No jobs found for this run[/yellow]")
             raise typer.Exit(1)
 
-        # Collect metrics
-        job_metrics: dict[str, dict[str, float]] = {}
-        for run_job in jobs:
-            metrics = storage.get_job_metrics(run_job.id)
-            job_metrics[run_job.id] = {m.metric_name: m.metric_value for m in metrics}
-
         # Group by provider
         providers: dict[str, list[ProviderJob]] = {}
-        for run_job in jobs:
+        for run_job, metrics in jobs:
             if run_job.provider not in providers:
                 providers[run_job.provider] = []
 
@@ -346,7 +340,7 @@ def report_command(
                 "model": run_job.model,
                 "status": run_job.status,
                 "error": run_job.error_message,
-                "metrics": job_metrics.get(run_job.id, {}),
+                "metrics": {m.metric_name: m.metric_value for m in metrics},
             }
             providers[run_job.provider].append(job_data)
 
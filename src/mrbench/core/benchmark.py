@@ -18,7 +18,23 @@ from mrbench.core.redaction import redact_for_storage
 if TYPE_CHECKING:
     from mrbench.adapters.base import Adapter
     from mrbench.adapters.registry import AdapterRegistry
-    from mrbench.core.storage import Storage
+    from mrbench.core.storage import MetricRow, Storage
+
+# libyaml's C loader when PyYAML was built against it, else the pure-Python one
+_SuiteLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_suite(path: Path) -> Any:
+    """Parse a suite YAML file with the fastest available safe loader.
+
+    Args:
+        path: Path to the suite file.
+
+    Returns:
+        The parsed YAML document (not validated).
+    """
+    with open(path) as f:
+        return yaml.load(f, Loader=_SuiteLoader)
 
 
 @dataclass
@@ -44,8 +60,7 @@ class BenchmarkSuite:
     @classmethod
     def from_yaml(cls, path: Path) -> BenchmarkSuite:
         """Load suite from YAML file."""
-        with open(path) as f:
-            loaded_data = yaml.safe_load(f)
+        loaded_data = load_suite(path)
 
         data = loaded_data if isinstance(loaded_data, dict) else {}
 
@@ -158,18 +173,19 @@ class BenchmarkOrchestrator:
                 # Create job
                 from mrbench.core.storage import hash_prompt
 
-                job = self._storage.create_job(
-                    run_id=run.id,
-                    provider=adapter.name,
-                    model=model,
-                    prompt_hash=hash_prompt(prompt.text),
-                    prompt_preview=(
-                        redact_for_storage(prompt.text[:100])
-                        if store_prompts and prompt.text
-                        else None
-                    ),
-                )
-                self._storage.start_job(job.id)
+                with self._storage.transaction():
+                    job = self._storage.create_job(
+                        run_id=run.id,
+                        provider=adapter.name,
+                        model=model,
+                        prompt_hash=hash_prompt(prompt.text),
+                        prompt_preview=(
+                            redact_for_storage(prompt.text[:100])
+                            if store_prompts and prompt.text
+                            else None
+                        ),
+                    )
+                    self._storage.start_job(job.id)
 
                 # Run prompt
                 options = RunOptions(model=model)
@@ -177,25 +193,30 @@ class BenchmarkOrchestrator:
                 try:
                     result = adapter.run(prompt.text, options)
 
-                    self._storage.complete_job(
-                        job.id,
-                        exit_code=result.exit_code,
-                        error_message=result.error,
-                    )
-
-                    # Add metrics
-                    self._storage.add_metric(job.id, "wall_time_ms", result.wall_time_ms, "ms")
-                    if result.ttft_ms is not None:
-                        self._storage.add_metric(job.id, "ttft_ms", result.ttft_ms, "ms")
-                    if result.token_count_output is not None:
-                        self._storage.add_metric(
+                    with self._storage.transaction():
+                        self._storage.complete_job(
                             job.id,
-                            "output_tokens",
-                            result.token_count_output,
-                            "tokens",
-                            is_estimated=result.tokens_estimated,
+                            exit_code=result.exit_code,
+                            error_message=result.error,
                         )
 
+                        # Add metrics
+                        metrics: list[MetricRow] = [
+                            ("wall_time_ms", result.wall_time_ms, "ms", False)
+                        ]
+                        if result.ttft_ms is not None:
+                            metrics.append(("ttft_ms", result.ttft_ms, "ms", False))
+                        if result.token_count_output is not None:
+                            metrics.append(
+                                (
+                                    "output_tokens",
+                                    result.token_count_output,
+                                    "tokens",
+                                    result.tokens_estimated,
+                                )
+                            )
+                        self._storage.add_metrics(job.id, metrics)
+
                     benchmark_run.results.append(
                         BenchmarkResult(
                             prompt_id=prompt.id,
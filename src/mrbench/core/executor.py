@@ -6,16 +6,23 @@ streaming support, and metric collection.
 
 from __future__ import annotations
 
+import codecs
+import io
+import math
 import os
+import select
+import selectors
 import signal
 import subprocess
 import time
 from collections.abc import Callable
 from dataclasses import dataclass, field
-from typing import IO
 
+# Maximum bytes pulled from a pipe per read while streaming
+_READ_SIZE = 65536
 
-@dataclass
+
+@dataclass(slots=True)
 class ExecutorResult:
     """Result from executing a subprocess."""
 
@@ -26,6 +33,108 @@ class ExecutorResult:
     timed_out: bool = False
     ttft_ms: float | None = None  # Time to first token (for streaming)
     chunks: list[str] = field(default_factory=list)
+    output_limit_exceeded: bool = False  # Killed for exceeding max_output_bytes
+
+
+def _decode_output(data: bytes | bytearray) -> str:
+    """Decode captured pipe bytes as UTF-8 with universal newlines."""
+    text = data.decode("utf-8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+class _LineSplitter:
+    """Incrementally decode UTF-8 pipe data and release it on line boundaries."""
+
+    def __init__(self) -> None:
+        # Translate \r\n and \r like text-mode pipes do, even across reads
+        self._decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            translate=True,
+        )
+        self._pending = ""
+
+    def feed(self, data: bytes) -> str:
+        """Consume a block of bytes and return any complete lines.
+
+        An empty ``data`` marks EOF and flushes the held-back partial line.
+        """
+        final = not data
+        buffered = self._pending + self._decoder.decode(data, final=final)
+        if final:
+            self._pending = ""
+            return buffered
+        cut = buffered.rfind("\n") + 1
+        self._pending = buffered[cut:]
+        return buffered[:cut]
+
+
+def _kill_process_group(process: subprocess.Popen[bytes]) -> None:
+    """Kill a process started with ``start_new_session`` and its descendants."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        process.kill()
+
+
+def _open_pidfd(pid: int) -> int | None:
+    """Open a pidfd that becomes readable when the process exits.
+
+    Returns None where pidfds are unavailable (non-Linux, or kernels < 5.3).
+    """
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is None:
+        return None
+    try:
+        fd: int = pidfd_open(pid)
+    except OSError:
+        return None
+    return fd
+
+
+class _PipePoller:
+    """Wait for readiness on non-blocking pipe fds.
+
+    Uses edge-triggered epoll directly where available (Linux) and falls back
+    to ``selectors.DefaultSelector`` elsewhere. A ready fd must be drained (or
+    filled) until ``BlockingIOError`` or EOF, since edge-triggered epoll reports
+    it only once.
+    """
+
+    def __init__(self) -> None:
+        self._epoll = select.epoll() if hasattr(select, "epoll") else None
+        self._selector = selectors.DefaultSelector() if self._epoll is None else None
+        self.fds: set[int] = set()
+
+    def register(self, fd: int, writable: bool = False) -> None:
+        if self._epoll is not None:
+            mask = select.EPOLLOUT if writable else select.EPOLLIN | select.EPOLLRDHUP
+            self._epoll.register(fd, mask | select.EPOLLET)
+        elif self._selector is not None:
+            self._selector.register(fd, selectors.EVENT_WRITE if writable else selectors.EVENT_READ)
+        self.fds.add(fd)
+
+    def unregister(self, fd: int) -> None:
+        if self._epoll is not None:
+            self._epoll.unregister(fd)
+        elif self._selector is not None:
+            self._selector.unregister(fd)
+        self.fds.discard(fd)
+
+    def poll(self, timeout: float) -> list[int]:
+        """Return the fds that became ready within ``timeout`` seconds."""
+        if self._epoll is not None:
+            return [fd for fd, _ in self._epoll.poll(timeout)]
+        if self._selector is not None:
+            return [key.fd for key, _ in self._selector.select(timeout)]
+        return []
+
+    def close(self) -> None:
+        if self._epoll is not None:
+            self._epoll.close()
+        elif self._selector is not None:
+            self._selector.close()
 
 
 class SubprocessExecutor:
@@ -35,15 +144,31 @@ class SubprocessExecutor:
         self,
         timeout: float = 300.0,
         env: dict[str, str] | None = None,
+        max_output_bytes: int | None = None,
     ) -> None:
         """Initialize executor.
 
+        The child environment (``os.environ`` merged with ``env``) is built once
+        here and reused for every run; call ``refresh_env()`` after mutating
+        ``os.environ`` if later runs should see the change.
+
         Args:
             timeout: Maximum execution time in seconds.
             env: Optional environment variables to add/override.
+            max_output_bytes: Optional combined stdout + stderr ceiling per run.
+                A process that produces more is killed so a runaway stream
+                cannot exhaust memory. ``None`` (the default) collects all
+                output.
         """
         self.timeout = timeout
         self.env = env
+        self.max_output_bytes = max_output_bytes
+        self._merged_env: dict[str, str] = {}
+        self.refresh_env()
+
+    def refresh_env(self) -> None:
+        """Rebuild the cached child environment from the current ``os.environ``."""
+        self._merged_env = {**os.environ, **(self.env or {})}
 
     def run(
         self,
@@ -59,176 +184,274 @@ class SubprocessExecutor:
             args: Command and arguments as list.
             stdin: Optional input to send to stdin.
             cwd: Optional working directory.
-            stream_callback: Optional callback for each line of output (for streaming).
+            stream_callback: Optional callback for each chunk of complete output lines
+                (for streaming).
             timeout: Optional timeout override in seconds for this invocation.
 
         Returns:
             ExecutorResult with stdout, stderr, timing, etc.
         """
-        start_time = time.perf_counter()
-        stdout_data: list[str] = []
-        stderr_data: list[str] = []
+        start_ns = time.perf_counter_ns()
+        stdout = ""
+        stderr = ""
         chunks: list[str] = []
         ttft_ms: float | None = None
         timed_out = False
+        limit_exceeded = False
         exit_code = -1
         effective_timeout = self.timeout if timeout is None else timeout
 
         try:
-            # Build environment
-            env = os.environ.copy()
-            if self.env:
-                env.update(self.env)
-
             process = subprocess.Popen(
                 args,
                 stdin=subprocess.PIPE if stdin else None,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 cwd=cwd,
-                env=env,
-                text=True,
-                # Use process group for proper timeout killing
+                env=self._merged_env,
+                # Binary pipes: output is decoded once here, not per line by
+                # a TextIOWrapper
+                bufsize=-1,
+                # Use process group for proper timeout killing. This rules out
+                # CPython's posix_spawn path (so does process_group=0), but on
+                # Linux the fork+exec path already uses vfork when no
+                # preexec_fn/uid/gid options are given, so keep it that way.
                 start_new_session=True,
             )
 
+            stderr_buf = bytearray()
             if stream_callback:
-                # Streaming mode: read line by line
-                ttft_ms, timed_out = self._stream_output(
+                # Streaming mode: stdout is the concatenation of the chunks
+                ttft_ms, timed_out, limit_exceeded = self._stream_output(
                     process,
                     stdin,
-                    stdout_data,
-                    stderr_data,
                     chunks,
+                    stderr_buf,
                     stream_callback,
-                    start_time,
+                    start_ns,
                     effective_timeout,
                 )
+                stdout = "".join(chunks)
             else:
-                # Non-streaming mode: use communicate with timeout
-                try:
-                    stdout, stderr = process.communicate(
-                        input=stdin,
-                        timeout=effective_timeout,
-                    )
-                    stdout_data.append(stdout)
-                    stderr_data.append(stderr)
-                except subprocess.TimeoutExpired:
-                    timed_out = True
-                    # Kill the process group
-                    try:
-                        os.killpg(process.pid, signal.SIGKILL)
-                    except (ProcessLookupError, PermissionError):
-                        process.kill()
-                    process.wait()
+                # Non-streaming mode: buffer raw stdout and decode once
+                stdout_buf = bytearray()
+                timed_out, limit_exceeded = self._communicate(
+                    process,
+                    stdin,
+                    stdout_buf.extend,
+                    stderr_buf,
+                    start_ns,
+                    effective_timeout,
+                )
+                stdout = _decode_output(stdout_buf)
+            stderr = _decode_output(stderr_buf)
+            if limit_exceeded:
+                stderr += f"\nOutput limit exceeded: more than {self.max_output_bytes} bytes"
 
             exit_code = process.returncode
 
         except FileNotFoundError:
-            stderr_data.append(f"Command not found: {args[0]}")
+            stderr = f"Command not found: {args[0]}"
             exit_code = 127
         except Exception as e:
-            stderr_data.append(f"Execution error: {e}")
+            stderr = f"Execution error: {e}"
             exit_code = 1
 
-        wall_time_ms = (time.perf_counter() - start_time) * 1000
+        wall_time_ms = (time.perf_counter_ns() - start_ns) / 1e6
 
         return ExecutorResult(
-            stdout="".join(stdout_data),
-            stderr="".join(stderr_data),
+            stdout=stdout,
+            stderr=stderr,
             exit_code=exit_code,
             wall_time_ms=wall_time_ms,
             timed_out=timed_out,
             ttft_ms=ttft_ms,
             chunks=chunks,
+            output_limit_exceeded=limit_exceeded,
         )
 
     def _stream_output(
         self,
-        process: subprocess.Popen[str],
+        process: subprocess.Popen[bytes],
         stdin: str | None,
-        stdout_data: list[str],
-        stderr_data: list[str],
         chunks: list[str],
+        stderr_buf: bytearray,
         callback: Callable[[str], None],
-        start_time: float,
+        start_ns: int,
         timeout: float,
-    ) -> tuple[float | None, bool]:
+    ) -> tuple[float | None, bool, bool]:
         """Stream output from process, collecting chunks and timing.
 
+        Each read hands every complete line it produced to ``callback`` as a
+        single chunk; a trailing partial line is held back until its newline
+        (or EOF) arrives.
+
         Returns:
-            Tuple of (time to first token in ms, timed_out flag).
+            Tuple of (time to first token in ms, timed_out flag,
+            output_limit_exceeded flag).
         """
-        import selectors
-
         ttft_ms: float | None = None
-        timed_out = False
+        splitter = _LineSplitter()
 
-        # Send stdin if provided
-        if stdin and process.stdin:
-            process.stdin.write(stdin)
-            process.stdin.close()
+        def on_stdout(data: bytes) -> None:
+            nonlocal ttft_ms
+            # Record TTFT on the first non-whitespace bytes, not the first full line
+            if ttft_ms is None and data.strip():
+                ttft_ms = (time.perf_counter_ns() - start_ns) / 1e6
 
-        # Set up selector for non-blocking reads
-        sel = selectors.DefaultSelector()
-        if process.stdout:
-            sel.register(process.stdout, selectors.EVENT_READ)
-        if process.stderr:
-            sel.register(process.stderr, selectors.EVENT_READ)
+            text = splitter.feed(data)
+            if text:
+                chunks.append(text)
+                callback(text)
 
-        deadline = start_time + timeout
+        timed_out, limit_exceeded = self._communicate(
+            process, stdin, on_stdout, stderr_buf, start_ns, timeout
+        )
+        return ttft_ms, timed_out, limit_exceeded
 
-        try:
-            while sel.get_map():
-                remaining = deadline - time.perf_counter()
-                if remaining <= 0:
-                    # Timeout
-                    timed_out = True
-                    try:
-                        os.killpg(process.pid, signal.SIGKILL)
-                    except (ProcessLookupError, PermissionError):
-                        process.kill()
-                    break
+    def _communicate(
+        self,
+        process: subprocess.Popen[bytes],
+        stdin: str | None,
+        on_stdout: Callable[[bytes], None],
+        stderr_buf: bytearray,
+        start_ns: int,
+        timeout: float,
+    ) -> tuple[bool, bool]:
+        """Feed stdin and collect output in a single-threaded poll loop.
 
-                events = sel.select(timeout=min(remaining, 0.1))
+        Pipes are used through their raw file descriptors: stdin is written as
+        the child accepts it (so a large prompt cannot deadlock against unread
+        output), and stdout/stderr are read in blocks of up to ``_READ_SIZE``
+        bytes. ``on_stdout`` receives every stdout block and finally ``b""`` at
+        EOF or when the process is killed; stderr bytes accumulate in ``stderr_buf``. Process exit is observed
+        through a pidfd in the same poll set where supported, falling back to
+        ``process.poll()`` on every iteration otherwise.
 
-                for key, _ in events:
-                    fileobj: IO[str] = key.fileobj  # type: ignore
-                    line = fileobj.readline()
+        Returns:
+            Tuple of (killed for exceeding ``timeout``, killed for producing more
+            than ``max_output_bytes``).
+        """
+        timed_out = False
+        limit_exceeded = False
+        total_bytes = 0
+        max_bytes = math.inf if self.max_output_bytes is None else self.max_output_bytes
+        poller = _PipePoller()
+        stdout_fd = process.stdout.fileno() if process.stdout else -1
+        readers: set[int] = set()
+        for stream in (process.stdout, process.stderr):
+            if stream is not None:
+                fd = stream.fileno()
+                os.set_blocking(fd, False)
+                poller.register(fd)
+                readers.add(fd)
+
+        pending = memoryview(stdin.encode() if stdin else b"")
+        stdin_fd = -1
+        if process.stdin:
+            stdin_fd = process.stdin.fileno()
+            os.set_blocking(stdin_fd, False)
+            poller.register(stdin_fd, writable=True)
+
+        pidfd = _open_pidfd(process.pid)
+        if pidfd is not None:
+            poller.register(pidfd)
+
+        def handle(fd: int, data: bytes) -> None:
+            nonlocal total_bytes
+            total_bytes += len(data)
+            if fd == stdout_fd:
+                on_stdout(data)
+            else:
+                stderr_buf.extend(data)
 
-                    if not line:
-                        sel.unregister(fileobj)
-                        continue
+        def drain(fd: int) -> None:
+            # Read until the pipe is empty; on EOF flush and stop watching it
+            while True:
+                try:
+                    data = os.read(fd, _READ_SIZE)
+                except BlockingIOError:
+                    return
+                handle(fd, data)
+                if not data:
+                    poller.unregister(fd)
+                    readers.discard(fd)
+                    return
+                if total_bytes > max_bytes:
+                    return
+
+        def close_stdin() -> None:
+            poller.unregister(stdin_fd)
+            if process.stdin:
+                process.stdin.close()
+
+        def feed_stdin() -> None:
+            nonlocal pending
+            try:
+                while pending:
+                    pending = pending[os.write(stdin_fd, pending) :]
+            except BlockingIOError:
+                return
+            except BrokenPipeError:
+                pass  # Child stopped reading; remaining input is dropped
+            close_stdin()
+
+        deadline_ns = start_ns + int(timeout * 1e9)
 
-                    if fileobj is process.stdout:
-                        stdout_data.append(line)
-                        chunks.append(line)
-                        callback(line)
+        try:
+            while readers:
+                remaining_ns = deadline_ns - time.perf_counter_ns()
+                if remaining_ns <= 0:
+                    timed_out = True
+                    _kill_process_group(process)
+                    break
 
-                        # Record TTFT on first non-empty output
-                        if ttft_ms is None and line.strip():
-                            ttft_ms = (time.perf_counter() - start_time) * 1000
-                    else:
-                        stderr_data.append(line)
+                exited = False
+                for fd in poller.poll(min(remaining_ns / 1e9, 0.1)):
+                    if fd == stdin_fd:
+                        feed_stdin()
+                    elif fd == pidfd:
+                        exited = True
+                    elif fd in readers:
+                        drain(fd)
+
+                if total_bytes > max_bytes:
+                    limit_exceeded = True
+                    _kill_process_group(process)
+                    break
 
                 # Check if process has exited
-                if process.poll() is not None:
-                    # Drain remaining output
-                    for key in list(sel.get_map().values()):
-                        fileobj = key.fileobj  # type: ignore
-                        remaining_output = fileobj.read()
-                        if remaining_output:
-                            if fileobj is process.stdout:
-                                stdout_data.append(remaining_output)
-                            else:
-                                stderr_data.append(remaining_output)
+                if exited or (pidfd is None and process.poll() is not None):
+                    # Drain whatever is already buffered without waiting on
+                    # descendants that may still hold the pipes open
+                    for fd in list(readers):
+                        drain(fd)
+                        if fd in readers:
+                            handle(fd, b"")
                     break
 
-        finally:
-            sel.close()
+            if stdout_fd in readers:
+                # Killed before stdout reached EOF; still flush what was read
+                on_stdout(b"")
 
+        finally:
+            poller.close()
+            if pidfd is not None:
+                os.close(pidfd)
+            if process.stdin and not process.stdin.closed:
+                process.stdin.close()
+
+        if not (timed_out or limit_exceeded):
+            # The child may close its pipes and keep running, so the deadline
+            # still applies after the last reader reaches EOF
+            remaining = max(deadline_ns - time.perf_counter_ns(), 0) / 1e9
+            try:
+                process.wait(timeout=remaining)
+            except subprocess.TimeoutExpired:
+                timed_out = True
+                _kill_process_group(process)
         process.wait()
-        return ttft_ms, timed_out
+        return timed_out, limit_exceeded
 
     def run_with_stdin_prompt(
         self,
@@ -2,47 +2,129 @@
 
 Automatically redacts sensitive patterns from text to prevent accidental exposure
 of API keys, tokens, and credentials in logs and outputs.
+
+When the optional ``google-re2`` package is installed (``pip install mrbench[re2]``)
+patterns are compiled with RE2, which matches in linear time without backtracking.
+Otherwise the stdlib ``re`` engine is used. All patterns stick to the syntax both
+engines share, so case-insensitivity is expressed inline with ``(?i)``. Patterns
+are compiled on first use rather than at import.
 """
 
 from __future__ import annotations
 
-import re
-from re import Pattern
+import functools
+from typing import Any
 
-# Compiled regex patterns for common secret formats
-REDACT_PATTERNS: list[tuple[str, Pattern[str]]] = [
+# Regex sources for common secret formats. They are compiled lazily on first use
+# (see _compiled_patterns) so importing this module stays cheap.
+_PATTERN_SOURCES: list[tuple[str, str]] = [
     # OpenAI API keys
-    ("OpenAI API Key", re.compile(r"sk-[a-zA-Z0-9]{20,}", re.IGNORECASE)),
+    ("OpenAI API Key", r"(?i)sk-[a-zA-Z0-9]{20,}"),
     # OpenAI project keys
-    ("OpenAI Project Key", re.compile(r"sk-proj-[a-zA-Z0-9_-]{20,}", re.IGNORECASE)),
+    ("OpenAI Project Key", r"(?i)sk-proj-[a-zA-Z0-9_-]{20,}"),
     # Anthropic API keys
-    ("Anthropic API Key", re.compile(r"sk-ant-[a-zA-Z0-9_-]{20,}", re.IGNORECASE)),
+    ("Anthropic API Key", r"(?i)sk-ant-[a-zA-Z0-9_-]{20,}"),
     # Generic anthropic keys
-    ("Anthropic Key", re.compile(r"anthropic-[a-zA-Z0-9]{20,}", re.IGNORECASE)),
+    ("Anthropic Key", r"(?i)anthropic-[a-zA-Z0-9]{20,}"),
     # Bearer tokens
-    ("Bearer Token", re.compile(r"Bearer\s+[a-zA-Z0-9._-]{10,}", re.IGNORECASE)),
+    ("Bearer Token", r"(?i)Bearer\s+[a-zA-Z0-9._-]{10,}"),
     # GitHub Personal Access Tokens
-    ("GitHub PAT", re.compile(r"ghp_[a-zA-Z0-9]{36,}")),
+    ("GitHub PAT", r"ghp_[a-zA-Z0-9]{36,}"),
     # GitHub OAuth tokens
-    ("GitHub OAuth", re.compile(r"gho_[a-zA-Z0-9]{36,}")),
+    ("GitHub OAuth", r"gho_[a-zA-Z0-9]{36,}"),
     # GitLab Personal Access Tokens
-    ("GitLab PAT", re.compile(r"glpat-[a-zA-Z0-9-]{20,}")),
+    ("GitLab PAT", r"glpat-[a-zA-Z0-9-]{20,}"),
     # Google API keys
-    ("Google API Key", re.compile(r"AIza[a-zA-Z0-9_-]{35}")),
+    ("Google API Key", r"AIza[a-zA-Z0-9_-]{35}"),
     # AWS Access Key IDs
-    ("AWS Access Key", re.compile(r"AKIA[A-Z0-9]{16}")),
+    ("AWS Access Key", r"AKIA[A-Z0-9]{16}"),
     # AWS Secret Keys (following common patterns)
-    ("AWS Secret Key", re.compile(r"(?:aws_secret|secret_key)\s*[:=]\s*['\"]?[a-zA-Z0-9/+=]{40}")),
+    ("AWS Secret Key", r"(?:aws_secret|secret_key)\s*[:=]\s*['\"]?[a-zA-Z0-9/+=]{40}"),
     # Generic password patterns
-    ("Password", re.compile(r"(?:password|passwd|pwd)\s*[:=]\s*['\"]?\S{8,}", re.IGNORECASE)),
+    ("Password", r"(?i)(?:password|passwd|pwd)\s*[:=]\s*['\"]?\S{8,}"),
     # Generic API key patterns
-    ("API Key", re.compile(r"(?:api[_-]?key)\s*[:=]\s*['\"]?[a-zA-Z0-9_-]{16,}", re.IGNORECASE)),
+    ("API Key", r"(?i)(?:api[_-]?key)\s*[:=]\s*['\"]?[a-zA-Z0-9_-]{16,}"),
     # Generic token patterns
-    ("Token", re.compile(r"(?:token|secret)\s*[:=]\s*['\"]?[a-zA-Z0-9_-]{16,}", re.IGNORECASE)),
+    ("Token", r"(?i)(?:token|secret)\s*[:=]\s*['\"]?[a-zA-Z0-9_-]{16,}"),
 ]
 
+
+@functools.cache
+def _regex_engine() -> Any:
+    """Return the ``re2`` module if installed, else the stdlib ``re`` module."""
+    try:
+        import re2
+    except ImportError:
+        import re
+
+        return re
+    return re2
+
+
+@functools.cache
+def _compiled_patterns() -> list[tuple[str, Any]]:
+    """Compile the redaction patterns on first use."""
+    engine = _regex_engine()
+    return [(name, engine.compile(source)) for name, source in _PATTERN_SOURCES]
+
+
+@functools.cache
+def _combined_pattern() -> Any:
+    """Compile a single alternation that matches wherever any pattern matches."""
+    alternatives = [
+        f"(?i:{source[4:]})" if source.startswith("(?i)") else f"(?:{source})"
+        for _name, source in _PATTERN_SOURCES
+    ]
+    return _regex_engine().compile("|".join(alternatives))
+
+
+def __getattr__(name: str) -> Any:
+    # REDACT_PATTERNS stays importable without compiling at import time (PEP 562)
+    if name == "REDACT_PATTERNS":
+        return _compiled_patterns()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 REDACTION_PLACEHOLDER = "[REDACTED]"
 
+# Shortest text any pattern can match ("pwd=" plus 8 characters). Anything
+# shorter, such as most command-line flags, never needs scanning.
+MIN_SECRET_LEN = 12
+
+# Case-folded literals such that every pattern match contains at least one.
+# Keep in sync with the patterns above: a missing anchor means a missed redaction.
+_ANCHORS: tuple[str, ...] = (
+    "sk-",
+    "anthropic-",
+    "bearer",
+    "ghp_",
+    "gho_",
+    "glpat-",
+    "aiza",
+    "akia",
+    "secret",
+    "passw",
+    "pwd",
+    "api",
+    "token",
+)
+
+
+def has_anchor(text: str) -> bool:
+    """Cheaply check whether text could contain a secret.
+
+    A False result guarantees no redaction pattern matches, so callers can skip
+    the regex scan entirely (e.g. per line of streamed output).
+
+    Args:
+        text: Text to check.
+
+    Returns:
+        True if text contains any literal that a secret pattern requires.
+    """
+    folded = text.casefold()
+    return any(anchor in folded for anchor in _ANCHORS)
+
 
 def redact_secrets(text: str, placeholder: str = REDACTION_PLACEHOLDER) -> str:
     """Redact known secret patterns from text.
@@ -54,8 +136,10 @@ def redact_secrets(text: str, placeholder: str = REDACTION_PLACEHOLDER) -> str:
     Returns:
         Text with secrets replaced by placeholder.
     """
+    if not has_anchor(text) or _combined_pattern().search(text) is None:
+        return text
     result = text
-    for _name, pattern in REDACT_PATTERNS:
+    for _name, pattern in _compiled_patterns():
         result = pattern.sub(placeholder, result)
     return result
 
@@ -82,7 +166,7 @@ def redact_command_args(args: list[str], placeholder: str = REDACTION_PLACEHOLDE
     Returns:
         Copy of args with secrets redacted.
     """
-    return [redact_secrets(arg, placeholder) for arg in args]
+    return [redact_secrets(arg, placeholder) if len(arg) >= MIN_SECRET_LEN else arg for arg in args]
 
 
 def count_redactions(text: str) -> int:
@@ -96,10 +180,9 @@ def count_redactions(text: str) -> int:
     Returns:
         Number of secret patterns found.
     """
-    count = 0
-    for _name, pattern in REDACT_PATTERNS:
-        count += len(pattern.findall(text))
-    return count
+    if not has_anchor(text):
+        return 0
+    return sum(1 for _name, pattern in _compiled_patterns() for _ in pattern.finditer(text))
 
 
 def has_secrets(text: str) -> bool:
@@ -111,7 +194,9 @@ def has_secrets(text: str) -> bool:
     Returns:
         True if any secret patterns are found.
     """
-    return count_redactions(text) > 0
+    if not has_anchor(text):
+        return False
+    return _combined_pattern().search(text) is not None
 
 
 def get_redaction_pattern_names() -> list[str]:
@@ -120,4 +205,4 @@ def get_redaction_pattern_names() -> list[str]:
     Returns:
         List of pattern names (e.g., ["OpenAI API Key", "GitHub PAT"]).
     """
-    return [name for name, _ in REDACT_PATTERNS]
+    return [name for name, _ in _PATTERN_SOURCES]
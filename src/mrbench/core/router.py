@@ -10,7 +10,7 @@ from enum import Enum
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from mrbench.adapters.base import Adapter
+    from mrbench.adapters.base import Adapter, AdapterCapabilities
 
 
 class RoutingPolicy(Enum):
@@ -26,7 +26,7 @@ class RoutingPolicy(Enum):
     OFFLINE_ONLY = "offline_only"  # Only local models
 
 
-@dataclass
+@dataclass(slots=True)
 class RoutingConstraints:
     """Constraints for provider selection."""
 
@@ -37,7 +37,7 @@ class RoutingConstraints:
     tool_calling_required: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class RoutingResult:
     """Result of routing decision."""
 
@@ -66,6 +66,8 @@ class Router:
             "goose",
             "opencode",
         ]
+        self._pref_index = {name: i for i, name in enumerate(self._preference_order)}
+        self._pref_fallback = len(self._preference_order)
 
     def route(
         self,
@@ -90,7 +92,7 @@ class Router:
         default_models = default_models or {}
 
         # Filter by constraints
-        candidates: list[tuple[Adapter, list[str]]] = []
+        candidates: list[tuple[Adapter, AdapterCapabilities, list[str]]] = []
 
         for adapter in adapters:
             caps = adapter.get_capabilities()
@@ -117,7 +119,7 @@ class Router:
                 continue
 
             reasons.append(f"{adapter.name} is available")
-            candidates.append((adapter, reasons))
+            candidates.append((adapter, caps, reasons))
 
         if not candidates:
             return None
@@ -127,14 +129,14 @@ class Router:
             candidates = self._sort_by_preference(candidates)
         elif self._policy == RoutingPolicy.OFFLINE_ONLY:
             # Filter to offline only (already done in constraints)
-            candidates = [(a, r) for a, r in candidates if a.get_capabilities().offline]
+            candidates = [(a, c, r) for a, c, r in candidates if c.offline]
         # FASTEST and CHEAPEST would need historical data - stub for now
 
         if not candidates:
             return None
 
-        selected, reasons = candidates[0]
-        alternatives = [a.name for a, _ in candidates[1:4]]
+        selected, _, reasons = candidates[0]
+        alternatives = [a.name for a, _, _ in candidates[1:4]]
 
         # Get model
         model = default_models.get(selected.name)
@@ -143,8 +145,8 @@ class Router:
             model = models[0] if models else "default"
 
         # Add preference reason
-        if selected.name in self._preference_order:
-            idx = self._preference_order.index(selected.name)
+        idx = self._pref_index.get(selected.name)
+        if idx is not None:
             reasons.append(f"Ranked #{idx + 1} in preference order")
 
         return RoutingResult(
@@ -155,15 +157,11 @@ class Router:
         )
 
     def _sort_by_preference(
-        self, candidates: list[tuple[Adapter, list[str]]]
-    ) -> list[tuple[Adapter, list[str]]]:
+        self, candidates: list[tuple[Adapter, AdapterCapabilities, list[str]]]
+    ) -> list[tuple[Adapter, AdapterCapabilities, list[str]]]:
         """Sort candidates by preference order."""
 
-        def key(item: tuple[Adapter, list[str]]) -> int:
-            adapter, _ = item
-            try:
-                return self._preference_order.index(adapter.name)
-            except ValueError:
-                return len(self._preference_order)
-
-        return sorted(candidates, key=key)
+        return sorted(
+            candidates,
+            key=lambda item: self._pref_index.get(item[0].name, self._pref_fallback),
+        )
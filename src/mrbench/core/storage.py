@@ -5,18 +5,26 @@ Handles persistence of benchmark runs, jobs, metrics, and capability snapshots.
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import json
+import os
+import queue
 import sqlite3
-import uuid
-from dataclasses import dataclass, field
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from datetime import UTC, datetime
 from pathlib import Path
 from types import TracebackType
 from typing import Any
 
 from mrbench.core.config import get_default_data_path
-from mrbench.core.redaction import redact_for_storage
+from mrbench.core.redaction import MIN_SECRET_LEN, has_anchor, redact_secrets
 
 
 def get_default_db_path() -> Path:
@@ -24,12 +32,16 @@ def get_default_db_path() -> Path:
     return get_default_data_path() / "mrbench.db"
 
 
+# Stored in PRAGMA user_version once SCHEMA has been applied. Bump it whenever
+# SCHEMA changes so existing databases pick up the new statements on open.
+SCHEMA_VERSION = 2
+
 SCHEMA = """
 CREATE TABLE IF NOT EXISTS runs (
     id TEXT PRIMARY KEY,
     created_at TEXT NOT NULL,
     suite_path TEXT,
-    config_snapshot TEXT,
+    config_snapshot BLOB,
     status TEXT NOT NULL DEFAULT 'running',
     completed_at TEXT
 );
@@ -39,14 +51,14 @@ CREATE TABLE IF NOT EXISTS jobs (
     run_id TEXT NOT NULL REFERENCES runs(id),
     provider TEXT NOT NULL,
     model TEXT NOT NULL,
-    prompt_hash TEXT NOT NULL,
+    prompt_hash BLOB NOT NULL,
     prompt_preview TEXT,
     prompt_stored INTEGER DEFAULT 0,
     status TEXT NOT NULL DEFAULT 'pending',
     created_at TEXT NOT NULL,
     started_at TEXT,
     completed_at TEXT,
-    error_message TEXT,
+    error_message BLOB,
     exit_code INTEGER
 );
 
@@ -66,33 +78,167 @@ CREATE TABLE IF NOT EXISTS capabilities (
     binary_path TEXT NOT NULL,
     binary_version TEXT,
     auth_status TEXT,
-    models_json TEXT,
-    features_json TEXT,
+    models_json BLOB,
+    features_json BLOB,
     UNIQUE(provider, binary_path)
 );
 
-CREATE INDEX IF NOT EXISTS idx_jobs_run_id ON jobs(run_id);
-CREATE INDEX IF NOT EXISTS idx_metrics_job_id ON metrics(job_id);
+-- (run_id, created_at) serves both run lookups and their ORDER BY; the
+-- metrics index serves per-job lookups and the report JOIN.
+DROP INDEX IF EXISTS idx_jobs_run_id;
+DROP INDEX IF EXISTS idx_metrics_job_id;
+CREATE INDEX IF NOT EXISTS idx_jobs_run_created ON jobs(run_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_metrics_job_name ON metrics(job_id, metric_name, metric_value);
 CREATE INDEX IF NOT EXISTS idx_capabilities_provider ON capabilities(provider);
 """
 
 
+# Connection PRAGMAs applied by default. WAL with synchronous=NORMAL avoids an
+# fsync of the rollback journal on every commit of the write-heavy bench loop.
+# page_size only takes effect on a fresh database and must precede the switch
+# to WAL; SQLite ignores it for existing files. mmap_size lets reads come
+# straight from a mapped region instead of a read() per page.
+DEFAULT_PRAGMAS: dict[str, str | int] = {
+    "page_size": 8192,
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -20000,
+    "busy_timeout": 5000,
+    "wal_autocheckpoint": 1000,
+    "mmap_size": 256 << 20,
+}
+
+
+# Size of each connection's prepared statement cache (sqlite3 default is 128).
+STATEMENT_CACHE_SIZE = 256
+
+# Write SQL, kept as constants so every call hands the connection the same
+# text and reuses its prepared statement.
+_SQL_INSERT_RUN = """
+INSERT INTO runs (id, created_at, suite_path, config_snapshot, status)
+VALUES (?, ?, ?, ?, 'running')
+"""
+_SQL_INSERT_JOB = """
+INSERT INTO jobs (id, run_id, provider, model, prompt_hash, prompt_preview, status, created_at)
+VALUES (?, ?, ?, ?, ?, ?, 'pending', ?)
+"""
+_SQL_SET_JOB_MODEL = "UPDATE jobs SET model = ? WHERE id = ?"
+_SQL_UPSERT_CAPABILITY = """
+INSERT INTO capabilities
+    (detected_at, provider, binary_path, binary_version, auth_status, models_json, features_json)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(provider, binary_path) DO UPDATE SET
+    detected_at = excluded.detected_at,
+    binary_version = excluded.binary_version,
+    auth_status = excluded.auth_status,
+    models_json = excluded.models_json,
+    features_json = excluded.features_json
+RETURNING id
+"""
+_SQL_START_JOB = "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?"
+_SQL_COMPLETE_JOB = """
+UPDATE jobs
+SET status = ?, completed_at = ?, exit_code = ?, error_message = ?
+WHERE id = ?
+"""
+_SQL_COMPLETE_RUN = "UPDATE runs SET status = ?, completed_at = ? WHERE id = ?"
+_SQL_INSERT_METRIC = """
+INSERT INTO metrics (job_id, metric_name, metric_value, metric_unit, is_estimated)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+
+# Number of decoded capability records Storage keeps in memory.
+CAPABILITY_CACHE_SIZE = 256
+
+
+# Text fields longer than this many UTF-8 bytes are stored compressed
+COMPRESS_MIN_BYTES = 1024
+
+# Prefixes marking compressed BLOBs; shorter values stay plain TEXT
+_ZSTD_MAGIC = b"zstd\x01"
+_ZLIB_MAGIC = b"zlib\x01"
+
+
+@functools.cache
+def _zstd() -> Any:
+    """Return the ``zstandard`` module if installed, else None."""
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def _maybe_compress(text: str | None) -> str | bytes | None:
+    """Compress long text for storage; short text is returned unchanged.
+
+    Uses zstd when ``zstandard`` is installed and zlib otherwise.
+    """
+    if text is None:
+        return None
+    data = text.encode()
+    if len(data) <= COMPRESS_MIN_BYTES:
+        return text
+    zstd = _zstd()
+    if zstd is not None:
+        return _ZSTD_MAGIC + bytes(zstd.compress(data))
+    return _ZLIB_MAGIC + zlib.compress(data)
+
+
+def _maybe_decompress(value: str | bytes | None) -> str | None:
+    """Reverse _maybe_compress for a value read back from storage."""
+    if value is None or isinstance(value, str):
+        return value
+    magic, payload = value[: len(_ZSTD_MAGIC)], value[len(_ZSTD_MAGIC) :]
+    if magic == _ZSTD_MAGIC:
+        zstd = _zstd()
+        if zstd is None:
+            raise RuntimeError("Stored value is zstd-compressed; install mrbench[zstd] to read it")
+        return str(zstd.decompress(payload).decode())
+    if magic == _ZLIB_MAGIC:
+        return zlib.decompress(payload).decode()
+    return value.decode()
+
+
 def _now_iso() -> str:
     """Get current UTC time in ISO format."""
     return datetime.now(UTC).isoformat()
 
 
 def _generate_id() -> str:
-    """Generate a new UUID."""
-    return str(uuid.uuid4())
+    """Generate a new UUIDv7 string.
+
+    The millisecond timestamp prefix keeps new ids roughly increasing, so
+    inserts land at the right edge of the primary-key B-tree instead of a
+    random leaf. The string keeps the canonical dashed UUID layout.
+    """
+    buf = bytearray((time.time_ns() // 1_000_000 & 0xFFFF_FFFF_FFFF).to_bytes(6, "big"))
+    buf += os.urandom(10)
+    buf[6] = (buf[6] & 0x0F) | 0x70  # version 7
+    buf[8] = (buf[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = buf.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def hash_prompt_bytes(prompt: str | bytes | memoryview) -> bytes:
+    """Generate the raw 32-byte SHA256 digest of a prompt.
 
+    Bytes-like prompts are hashed without copying; text is encoded to UTF-8
+    once, with lone surrogates passed through rather than rejected.
+    """
+    if isinstance(prompt, str):
+        prompt = prompt.encode("utf-8", "surrogatepass")
+    return hashlib.sha256(prompt).digest()
 
-def hash_prompt(prompt: str) -> str:
-    """Generate SHA256 hash of prompt text."""
-    return hashlib.sha256(prompt.encode()).hexdigest()
 
+def hash_prompt(prompt: str | bytes | memoryview) -> str:
+    """Generate SHA256 hash of prompt text as a hex string."""
+    return hash_prompt_bytes(prompt).hex()
 
-@dataclass
+
+@dataclass(slots=True)
 class Run:
     """Represents a benchmark run."""
 
@@ -104,7 +250,7 @@ class Run:
     completed_at: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Job:
     """Represents a single job within a run."""
 
@@ -123,7 +269,11 @@ class Job:
     exit_code: int | None = None
 
 
-@dataclass
+# (metric_name, metric_value, metric_unit, is_estimated) for Storage.add_metrics
+MetricRow = tuple[str, float, str | None, bool]
+
+
+@dataclass(slots=True)
 class Metric:
     """Represents a metric measurement."""
 
@@ -135,7 +285,7 @@ class Metric:
     is_estimated: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class Capability:
     """Represents detected provider capabilities."""
 
@@ -149,44 +299,293 @@ class Capability:
     features: dict[str, Any] = field(default_factory=dict)
 
 
+# Explicit column lists in dataclass field order, read by the positional
+# row factories below instead of building sqlite3.Row objects.
+_RUN_COLUMNS = "id, created_at, status, suite_path, config_snapshot, completed_at"
+_JOB_COLUMNS = (
+    "id, run_id, provider, model, prompt_hash, status, created_at, prompt_preview,"
+    " prompt_stored, started_at, completed_at, error_message, exit_code"
+)
+_METRIC_COLUMNS = "id, job_id, metric_name, metric_value, metric_unit, is_estimated"
+_CAPABILITY_COLUMNS = (
+    "id, detected_at, provider, binary_path, binary_version, auth_status,"
+    " models_json, features_json"
+)
+
+
+def _run_row(cursor: sqlite3.Cursor, row: tuple[Any, ...]) -> Run:
+    """Build a Run from a row selected with _RUN_COLUMNS."""
+    run = Run(*row)
+    run.config_snapshot = _maybe_decompress(run.config_snapshot)
+    return run
+
+
+def _job_row(cursor: sqlite3.Cursor, row: tuple[Any, ...]) -> Job:
+    """Build a Job from a row selected with _JOB_COLUMNS."""
+    job = Job(*row)
+    if isinstance(job.prompt_hash, bytes):
+        job.prompt_hash = job.prompt_hash.hex()
+    job.prompt_stored = bool(job.prompt_stored)
+    job.error_message = _maybe_decompress(job.error_message)
+    return job
+
+
+def _metric_row(cursor: sqlite3.Cursor, row: tuple[Any, ...]) -> Metric:
+    """Build a Metric from a row selected with _METRIC_COLUMNS."""
+    metric = Metric(*row)
+    metric.is_estimated = bool(metric.is_estimated)
+    return metric
+
+
+def _capability_row(cursor: sqlite3.Cursor, row: tuple[Any, ...]) -> Capability:
+    """Build a Capability from a row selected with _CAPABILITY_COLUMNS."""
+    cap_id, detected_at, provider, binary_path, version, auth, models_json, features_json = row
+    return Capability(
+        cap_id,
+        detected_at,
+        provider,
+        binary_path,
+        version,
+        auth,
+        json.loads(_maybe_decompress(models_json) or "[]"),
+        json.loads(_maybe_decompress(features_json) or "{}"),
+    )
+
+
+_JOB_FIELDS = [name.strip() for name in _JOB_COLUMNS.split(",")]
+_JOB_WITH_METRIC_COLUMNS = (
+    ", ".join(f"j.{name}" for name in _JOB_FIELDS)
+    + ", m.id, m.metric_name, m.metric_value, m.metric_unit, m.is_estimated"
+)
+
+
+def _job_with_metric_row(cursor: sqlite3.Cursor, row: tuple[Any, ...]) -> tuple[Job, Metric | None]:
+    """Split a jobs LEFT JOIN metrics row into its Job and optional Metric."""
+    job = _job_row(cursor, row[: len(_JOB_FIELDS)])
+    metric_id, name, value, unit, estimated = row[len(_JOB_FIELDS) :]
+    if metric_id is None:
+        return job, None
+    return job, Metric(metric_id, job.id, name, value, unit, bool(estimated))
+
+
+def _query(
+    conn: sqlite3.Connection,
+    factory: Callable[[sqlite3.Cursor, tuple[Any, ...]], object],
+    sql: str,
+    params: tuple[Any, ...],
+) -> sqlite3.Cursor:
+    """Execute a SELECT on a fresh cursor that builds rows with ``factory``."""
+    cursor = conn.cursor()
+    cursor.row_factory = factory
+    return cursor.execute(sql, params)
+
+
+def _might_need_redaction(text: str) -> bool:
+    """Check whether text is long enough and has an anchor a secret needs."""
+    return len(text) >= MIN_SECRET_LEN and has_anchor(text)
+
+
+def _redact_if_needed(text: str | None) -> str | None:
+    """Redact a nullable string for storage, skipping text that cannot match."""
+    if text is None or not _might_need_redaction(text):
+        return text
+    return redact_secrets(text)
+
+
+def _prompt_hash_param(prompt_hash: str) -> str | bytes:
+    """Bind a lowercase hex digest as its raw bytes; store any other string as given.
+
+    ``_job_row`` turns the bytes back into the same hex string, so the
+    compact BLOB form never leaks past the SQL layer.
+    """
+    try:
+        digest = bytes.fromhex(prompt_hash)
+    except ValueError:
+        return prompt_hash
+    return digest if digest.hex() == prompt_hash else prompt_hash
+
+
+def _migrate_prompt_hashes(cursor: sqlite3.Cursor) -> None:
+    """Convert hex TEXT prompt hashes written by older versions to BLOB digests."""
+    rows = cursor.execute(
+        "SELECT id, prompt_hash FROM jobs WHERE typeof(prompt_hash) = 'text'"
+    ).fetchall()
+    updates = [
+        (param, job_id)
+        for job_id, prompt_hash in rows
+        if isinstance(param := _prompt_hash_param(prompt_hash), bytes)
+    ]
+    cursor.executemany("UPDATE jobs SET prompt_hash = ? WHERE id = ?", updates)
+
+
+def _copy_capability(capability: Capability) -> Capability:
+    """Copy a capability so callers cannot mutate a cached instance's containers."""
+    return replace(
+        capability,
+        models=list(capability.models),
+        features=dict(capability.features),
+    )
+
+
 class Storage:
     """SQLite storage manager for mrbench."""
 
-    def __init__(self, db_path: Path | None = None) -> None:
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        pragmas: dict[str, str | int] | None = None,
+        max_readers: int | None = None,
+    ) -> None:
         """Initialize storage.
 
         Args:
             db_path: Path to SQLite database file. If None, uses default location.
+            pragmas: PRAGMAs to apply to each connection. If None, uses
+                ``DEFAULT_PRAGMAS``; pass ``{}`` for SQLite's defaults.
+            max_readers: Size of the read-only connection pool. If None,
+                uses the CPU count.
         """
         if db_path is None:
             db_path = get_default_db_path()
 
         self.db_path = db_path
+        self._pragmas = DEFAULT_PRAGMAS if pragmas is None else pragmas
 
         # Ensure parent directory exists
         db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        self._conn: sqlite3.Connection | None = None
+        self._writer: sqlite3.Connection | None = None
+        self._write_cursor: sqlite3.Cursor | None = None
+        # Re-entrant so transaction() can hold it across nested write calls
+        self._write_lock = threading.RLock()
+        # Depth of nested transaction() blocks; only the outermost one issues
+        # BEGIN and COMMIT.
+        self._tx_depth = 0
+
+        # Idle read-only connections, opened on demand up to _max_readers
+        self._readers: queue.Queue[sqlite3.Connection] = queue.Queue()
+        self._reader_conns: list[sqlite3.Connection] = []
+        self._reader_lock = threading.Lock()
+        self._max_readers = max_readers if max_readers is not None else os.cpu_count() or 4
+
+        # (provider, binary_path) -> (row id, decoded Capability), in LRU order
+        self._caps_cache: OrderedDict[tuple[str, str], tuple[int, Capability]] = OrderedDict()
+        self._caps_lock = threading.Lock()
+
         self._init_db()
 
-    def _get_conn(self) -> sqlite3.Connection:
-        """Get database connection, creating if needed."""
-        if self._conn is None:
-            self._conn = sqlite3.connect(self.db_path)
-            self._conn.row_factory = sqlite3.Row
-        return self._conn
+    def _connect(self) -> sqlite3.Connection:
+        """Open an autocommit connection with the configured PRAGMAs applied."""
+        conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        # Applied before any write so journal_mode takes effect first
+        for name, value in self._pragmas.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+
+    def _get_writer(self) -> sqlite3.Connection:
+        """Get the writer connection, creating if needed.
+
+        The writer runs in autocommit mode: a single-statement write commits
+        on its own, and multi-statement writes go through transaction().
+        """
+        if self._writer is None:
+            self._writer = self._connect()
+            # Writes are serialized by _write_lock, so one cursor serves them all
+            self._write_cursor = self._writer.cursor()
+        return self._writer
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Cursor]:
+        """Hold the writer lock and yield the shared writer cursor."""
+        with self._write_lock:
+            self._get_writer()
+            assert self._write_cursor is not None
+            yield self._write_cursor
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        """Check out a read-only connection from the pool."""
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._reader_lock:
+                opened = len(self._reader_conns) < self._max_readers
+                if opened:
+                    conn = self._connect()
+                    conn.row_factory = sqlite3.Row
+                    conn.execute("PRAGMA query_only=1")
+                    self._reader_conns.append(conn)
+            if not opened:
+                conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
 
     def _init_db(self) -> None:
-        """Initialize database schema."""
-        conn = self._get_conn()
-        conn.executescript(SCHEMA)
-        conn.commit()
+        """Initialize database schema unless it is already at SCHEMA_VERSION."""
+        with self._write() as cursor:
+            if cursor.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+                return
+            cursor.executescript(SCHEMA)
+            with self.transaction():
+                _migrate_prompt_hashes(cursor)
+                cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @contextmanager
+    def transaction(self) -> Iterator[Storage]:
+        """Group several write calls into a single transaction.
+
+        Write methods called inside the block join it instead of committing
+        on their own; the outermost block commits on success and rolls back
+        on error, including when the commit itself fails. Nested blocks join
+        the enclosing transaction. Reads go through separate connections and
+        do not see the block's writes until it commits.
+
+        Yields:
+            This Storage instance.
+        """
+        with self._write() as cursor:
+            if self._tx_depth == 0:
+                cursor.execute("BEGIN IMMEDIATE")
+            self._tx_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._tx_depth -= 1
+                if self._tx_depth == 0:
+                    cursor.execute("ROLLBACK")
+                raise
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                try:
+                    cursor.execute("COMMIT")
+                except BaseException:
+                    # A failed COMMIT can leave the transaction open, and later
+                    # autocommit writes would silently join it
+                    if cursor.connection.in_transaction:
+                        cursor.execute("ROLLBACK")
+                    raise
 
     def close(self) -> None:
-        """Close database connection."""
-        if self._conn is not None:
-            self._conn.close()
-            self._conn = None
+        """Close the writer and all reader connections."""
+        with self._write_lock:
+            if self._writer is not None:
+                if self._write_cursor is not None:
+                    self._write_cursor.close()
+                    self._write_cursor = None
+                self._writer.close()
+                self._writer = None
+        with self._reader_lock:
+            for conn in self._reader_conns:
+                conn.close()
+            self._reader_conns.clear()
+            self._readers = queue.Queue()
 
     def __enter__(self) -> Storage:
         """Support context-manager usage for deterministic connection cleanup."""
@@ -198,14 +597,27 @@ class Storage:
         exc: BaseException | None,
         tb: TracebackType | None,
     ) -> None:
-        """Close the connection on context exit."""
+        """Close the connections on context exit."""
         self.close()
 
+    def stats(self) -> dict[str, int | str]:
+        """Report the effective storage settings and database size.
+
+        Returns:
+            Mapping with ``page_size``, ``page_count``, ``mmap_size`` and
+            ``journal_mode`` as seen by a reader connection.
+        """
+        with self._read() as conn:
+            return {
+                name: conn.execute(f"PRAGMA {name}").fetchone()[0]
+                for name in ("page_size", "page_count", "mmap_size", "journal_mode")
+            }
+
     def list_tables(self) -> list[str]:
         """List all tables in database."""
-        conn = self._get_conn()
-        cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        return [row["name"] for row in cursor.fetchall()]
+        with self._read() as conn:
+            cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            return [row["name"] for row in cursor.fetchall()]
 
     # Run methods
 
@@ -227,67 +639,43 @@ class Storage:
         created_at = _now_iso()
         config_json = json.dumps(config_snapshot) if config_snapshot else None
 
-        conn = self._get_conn()
-        conn.execute(
-            """
-            INSERT INTO runs (id, created_at, suite_path, config_snapshot, status)
-            VALUES (?, ?, ?, ?, 'running')
-            """,
-            (run_id, created_at, suite_path, config_json),
-        )
-        conn.commit()
-
-        return Run(
-            id=run_id,
-            created_at=created_at,
-            status="running",
-            suite_path=suite_path,
-            config_snapshot=config_json,
-        )
+        with self._write() as cursor:
+            cursor.execute(
+                _SQL_INSERT_RUN,
+                (run_id, created_at, suite_path, _maybe_compress(config_json)),
+            )
+
+            return Run(
+                id=run_id,
+                created_at=created_at,
+                status="running",
+                suite_path=suite_path,
+                config_snapshot=config_json,
+            )
 
     def get_run(self, run_id: str) -> Run | None:
         """Get a run by ID."""
-        conn = self._get_conn()
-        cursor = conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,))
-        row = cursor.fetchone()
-        if row is None:
-            return None
-        return Run(
-            id=row["id"],
-            created_at=row["created_at"],
-            status=row["status"],
-            suite_path=row["suite_path"],
-            config_snapshot=row["config_snapshot"],
-            completed_at=row["completed_at"],
-        )
+        with self._read() as conn:
+            run: Run | None = _query(
+                conn, _run_row, f"SELECT {_RUN_COLUMNS} FROM runs WHERE id = ?", (run_id,)
+            ).fetchone()
+            return run
 
     def complete_run(self, run_id: str, status: str = "completed") -> None:
         """Mark a run as completed."""
-        conn = self._get_conn()
-        conn.execute(
-            "UPDATE runs SET status = ?, completed_at = ? WHERE id = ?",
-            (status, _now_iso(), run_id),
-        )
-        conn.commit()
+        with self._write() as cursor:
+            cursor.execute(_SQL_COMPLETE_RUN, (status, _now_iso(), run_id))
 
     def list_runs(self, limit: int = 50) -> list[Run]:
         """List recent runs."""
-        conn = self._get_conn()
-        cursor = conn.execute(
-            "SELECT * FROM runs ORDER BY created_at DESC LIMIT ?",
-            (limit,),
-        )
-        return [
-            Run(
-                id=row["id"],
-                created_at=row["created_at"],
-                status=row["status"],
-                suite_path=row["suite_path"],
-                config_snapshot=row["config_snapshot"],
-                completed_at=row["completed_at"],
-            )
-            for row in cursor.fetchall()
-        ]
+        with self._read() as conn:
+            runs: list[Run] = _query(
+                conn,
+                _run_row,
+                f"SELECT {_RUN_COLUMNS} FROM runs ORDER BY created_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+            return runs
 
     # Job methods
 
@@ -305,7 +693,8 @@ class Storage:
             run_id: Parent run ID.
             provider: Provider name (e.g., "ollama").
             model: Model name (e.g., "llama3.2").
-            prompt_hash: SHA256 hash of prompt.
+            prompt_hash: SHA256 hash of prompt (see ``hash_prompt``). Hex
+                digests are stored as raw bytes.
             prompt_preview: First 100 chars of prompt (redacted).
 
         Returns:
@@ -314,37 +703,37 @@ class Storage:
         job_id = _generate_id()
         created_at = _now_iso()
 
-        stored_preview = redact_for_storage(prompt_preview)
-
-        conn = self._get_conn()
-        conn.execute(
-            """
-            INSERT INTO jobs (id, run_id, provider, model, prompt_hash, prompt_preview, status, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, 'pending', ?)
-            """,
-            (job_id, run_id, provider, model, prompt_hash, stored_preview, created_at),
-        )
-        conn.commit()
+        stored_preview = _redact_if_needed(prompt_preview)
+
+        with self._write() as cursor:
+            cursor.execute(
+                _SQL_INSERT_JOB,
+                (
+                    job_id,
+                    run_id,
+                    provider,
+                    model,
+                    _prompt_hash_param(prompt_hash),
+                    stored_preview,
+                    created_at,
+                ),
+            )
 
-        return Job(
-            id=job_id,
-            run_id=run_id,
-            provider=provider,
-            model=model,
-            prompt_hash=prompt_hash,
-            status="pending",
-            created_at=created_at,
-            prompt_preview=stored_preview,
-        )
+            return Job(
+                id=job_id,
+                run_id=run_id,
+                provider=provider,
+                model=model,
+                prompt_hash=prompt_hash,
+                status="pending",
+                created_at=created_at,
+                prompt_preview=stored_preview,
+            )
 
     def start_job(self, job_id: str) -> None:
         """Mark a job as started."""
-        conn = self._get_conn()
-        conn.execute(
-            "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?",
-            (_now_iso(), job_id),
-        )
-        conn.commit()
+        with self._write() as cursor:
+            cursor.execute(_SQL_START_JOB, (_now_iso(), job_id))
 
     def complete_job(
         self,
@@ -354,75 +743,76 @@ class Storage:
     ) -> None:
         """Mark a job as completed."""
         status = "completed" if exit_code == 0 else "failed"
-        stored_error = redact_for_storage(error_message)
-        conn = self._get_conn()
-        conn.execute(
-            """
-            UPDATE jobs
-            SET status = ?, completed_at = ?, exit_code = ?, error_message = ?
-            WHERE id = ?
-            """,
-            (status, _now_iso(), exit_code, stored_error, job_id),
-        )
-        conn.commit()
+        stored_error = _redact_if_needed(error_message)
+        with self._write() as cursor:
+            cursor.execute(
+                _SQL_COMPLETE_JOB,
+                (status, _now_iso(), exit_code, _maybe_compress(stored_error), job_id),
+            )
 
     def set_job_model(self, job_id: str, model: str) -> None:
         """Update the model recorded for a job."""
-        conn = self._get_conn()
-        conn.execute(
-            "UPDATE jobs SET model = ? WHERE id = ?",
-            (model, job_id),
-        )
-        conn.commit()
+        with self._write() as cursor:
+            cursor.execute(_SQL_SET_JOB_MODEL, (model, job_id))
 
     def get_job(self, job_id: str) -> Job | None:
         """Get a job by ID."""
-        conn = self._get_conn()
-        cursor = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
-        row = cursor.fetchone()
-        if row is None:
-            return None
-        return Job(
-            id=row["id"],
-            run_id=row["run_id"],
-            provider=row["provider"],
-            model=row["model"],
-            prompt_hash=row["prompt_hash"],
-            status=row["status"],
-            created_at=row["created_at"],
-            prompt_preview=row["prompt_preview"],
-            prompt_stored=bool(row["prompt_stored"]),
-            started_at=row["started_at"],
-            completed_at=row["completed_at"],
-            error_message=row["error_message"],
-            exit_code=row["exit_code"],
-        )
+        with self._read() as conn:
+            job: Job | None = _query(
+                conn, _job_row, f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            return job
 
     def get_jobs_for_run(self, run_id: str) -> list[Job]:
         """Get all jobs for a run."""
-        conn = self._get_conn()
-        cursor = conn.execute(
-            "SELECT * FROM jobs WHERE run_id = ? ORDER BY created_at",
-            (run_id,),
-        )
-        return [
-            Job(
-                id=row["id"],
-                run_id=row["run_id"],
-                provider=row["provider"],
-                model=row["model"],
-                prompt_hash=row["prompt_hash"],
-                status=row["status"],
-                created_at=row["created_at"],
-                prompt_preview=row["prompt_preview"],
-                prompt_stored=bool(row["prompt_stored"]),
-                started_at=row["started_at"],
-                completed_at=row["completed_at"],
-                error_message=row["error_message"],
-                exit_code=row["exit_code"],
-            )
-            for row in cursor.fetchall()
-        ]
+        with self._read() as conn:
+            jobs: list[Job] = _query(
+                conn,
+                _job_row,
+                f"SELECT {_JOB_COLUMNS} FROM jobs WHERE run_id = ? ORDER BY created_at",
+                (run_id,),
+            ).fetchall()
+            return jobs
+
+    def count_jobs_for_run(self, run_id: str) -> int:
+        """Count a run's jobs from the run index without loading any rows."""
+        with self._read() as conn:
+            cursor = conn.execute("SELECT COUNT(*) FROM jobs WHERE run_id = ?", (run_id,))
+            count: int = cursor.fetchone()[0]
+            return count
+
+    def get_jobs_with_metrics(self, run_id: str) -> list[tuple[Job, list[Metric]]]:
+        """Get all jobs for a run together with their metrics.
+
+        Loads everything with one JOIN instead of a metrics query per job.
+
+        Args:
+            run_id: Run ID.
+
+        Returns:
+            ``(job, metrics)`` pairs in job creation order.
+        """
+        with self._read() as conn:
+            rows: list[tuple[Job, Metric | None]] = _query(
+                conn,
+                _job_with_metric_row,
+                f"""
+                SELECT {_JOB_WITH_METRIC_COLUMNS}
+                FROM jobs j LEFT JOIN metrics m ON m.job_id = j.id
+                WHERE j.run_id = ?
+                ORDER BY j.created_at, m.id
+                """,
+                (run_id,),
+            ).fetchall()
+
+        grouped: dict[str, tuple[Job, list[Metric]]] = {}
+        for job, metric in rows:
+            entry = grouped.get(job.id)
+            if entry is None:
+                entry = grouped[job.id] = (job, [])
+            if metric is not None:
+                entry[1].append(metric)
+        return list(grouped.values())
 
     # Metric methods
 
@@ -446,43 +836,56 @@ class Storage:
         Returns:
             Created Metric object.
         """
-        conn = self._get_conn()
-        cursor = conn.execute(
-            """
-            INSERT INTO metrics (job_id, metric_name, metric_value, metric_unit, is_estimated)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (job_id, metric_name, metric_value, metric_unit, int(is_estimated)),
-        )
-        conn.commit()
-
-        return Metric(
-            id=cursor.lastrowid or 0,
-            job_id=job_id,
-            metric_name=metric_name,
-            metric_value=metric_value,
-            metric_unit=metric_unit,
-            is_estimated=is_estimated,
-        )
+        with self._write() as cursor:
+            cursor.execute(
+                _SQL_INSERT_METRIC,
+                (job_id, metric_name, metric_value, metric_unit, int(is_estimated)),
+            )
+
+            return Metric(
+                id=cursor.lastrowid or 0,
+                job_id=job_id,
+                metric_name=metric_name,
+                metric_value=metric_value,
+                metric_unit=metric_unit,
+                is_estimated=is_estimated,
+            )
+
+    def add_metrics(self, job_id: str, metrics: list[MetricRow]) -> None:
+        """Add several metrics for a job in a single statement and transaction.
+
+        Args:
+            job_id: Job ID.
+            metrics: ``(metric_name, metric_value, metric_unit, is_estimated)`` rows.
+        """
+        if not metrics:
+            return
+        with self.transaction(), self._write() as cursor:
+            cursor.executemany(
+                _SQL_INSERT_METRIC,
+                [
+                    (job_id, name, value, unit, int(estimated))
+                    for name, value, unit, estimated in metrics
+                ],
+            )
 
     def get_job_metrics(self, job_id: str) -> list[Metric]:
         """Get all metrics for a job."""
-        conn = self._get_conn()
-        cursor = conn.execute(
-            "SELECT * FROM metrics WHERE job_id = ?",
-            (job_id,),
-        )
-        return [
-            Metric(
-                id=row["id"],
-                job_id=row["job_id"],
-                metric_name=row["metric_name"],
-                metric_value=row["metric_value"],
-                metric_unit=row["metric_unit"],
-                is_estimated=bool(row["is_estimated"]),
-            )
-            for row in cursor.fetchall()
-        ]
+        with self._read() as conn:
+            metrics: list[Metric] = _query(
+                conn,
+                _metric_row,
+                f"SELECT {_METRIC_COLUMNS} FROM metrics WHERE job_id = ?",
+                (job_id,),
+            ).fetchall()
+            return metrics
+
+    def count_metrics_for_job(self, job_id: str) -> int:
+        """Count a job's metrics from the metrics index without loading any rows."""
+        with self._read() as conn:
+            cursor = conn.execute("SELECT COUNT(*) FROM metrics WHERE job_id = ?", (job_id,))
+            count: int = cursor.fetchone()[0]
+            return count
 
     # Capability methods
 
@@ -506,83 +909,108 @@ class Storage:
             features: Feature dictionary.
 
         Returns:
-            Created or updated Capability object.
+            Created or updated Capability object, carrying the given models
+            and features rather than a decode of the stored JSON.
         """
         detected_at = _now_iso()
-        models_json = json.dumps(models or [])
-        features_json = json.dumps(features or {})
-
-        conn = self._get_conn()
-        conn.execute(
-            """
-            INSERT INTO capabilities
-                (detected_at, provider, binary_path, binary_version, auth_status, models_json, features_json)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(provider, binary_path) DO UPDATE SET
-                detected_at = excluded.detected_at,
-                binary_version = excluded.binary_version,
-                auth_status = excluded.auth_status,
-                models_json = excluded.models_json,
-                features_json = excluded.features_json
-            """,
-            (
-                detected_at,
-                provider,
-                binary_path,
-                binary_version,
-                auth_status,
-                models_json,
-                features_json,
-            ),
-        )
-        conn.commit()
+        models = list(models or [])
+        features = dict(features or {})
+        models_json = json.dumps(models)
+        features_json = json.dumps(features)
+
+        with self._write() as cursor:
+            # RETURNING hands back the row id for both the insert and update paths
+            cursor.execute(
+                _SQL_UPSERT_CAPABILITY,
+                (
+                    detected_at,
+                    provider,
+                    binary_path,
+                    binary_version,
+                    auth_status,
+                    _maybe_compress(models_json),
+                    _maybe_compress(features_json),
+                ),
+            )
+            # Draining the cursor finishes the statement, releasing the write
+            (row,) = cursor.fetchall()
 
-        # Fetch the saved record
-        cursor = conn.execute(
-            "SELECT * FROM capabilities WHERE provider = ? AND binary_path = ?",
-            (provider, binary_path),
-        )
-        row = cursor.fetchone()
+        # The next get_capabilities() reloads this entry from the table
+        with self._caps_lock:
+            self._caps_cache.pop((provider, binary_path), None)
 
         return Capability(
-            id=row["id"],
-            detected_at=row["detected_at"],
-            provider=row["provider"],
-            binary_path=row["binary_path"],
-            binary_version=row["binary_version"],
-            auth_status=row["auth_status"],
-            models=json.loads(row["models_json"] or "[]"),
-            features=json.loads(row["features_json"] or "{}"),
+            id=row[0],
+            detected_at=detected_at,
+            provider=provider,
+            binary_path=binary_path,
+            binary_version=binary_version,
+            auth_status=auth_status,
+            models=models,
+            features=features,
         )
 
     def get_capabilities(self, provider: str | None = None) -> list[Capability]:
         """Get stored capabilities.
 
+        Rows whose id and detection time match a cached entry reuse the
+        already-decoded models and features instead of parsing their JSON
+        again.
+
         Args:
             provider: Optional provider filter.
 
         Returns:
             List of Capability objects.
         """
-        conn = self._get_conn()
-        if provider:
-            cursor = conn.execute(
-                "SELECT * FROM capabilities WHERE provider = ?",
-                (provider,),
-            )
-        else:
-            cursor = conn.execute("SELECT * FROM capabilities")
-
-        return [
-            Capability(
-                id=row["id"],
-                detected_at=row["detected_at"],
-                provider=row["provider"],
-                binary_path=row["binary_path"],
-                binary_version=row["binary_version"],
-                auth_status=row["auth_status"],
-                models=json.loads(row["models_json"] or "[]"),
-                features=json.loads(row["features_json"] or "{}"),
-            )
-            for row in cursor.fetchall()
-        ]
+        with self._read() as conn:
+            if provider:
+                cursor = conn.execute(
+                    "SELECT id, detected_at, provider, binary_path FROM capabilities"
+                    " WHERE provider = ?",
+                    (provider,),
+                )
+            else:
+                cursor = conn.execute(
+                    "SELECT id, detected_at, provider, binary_path FROM capabilities"
+                )
+            keys = cursor.fetchall()
+
+            results: list[Capability | None] = []
+            missing: dict[int, int] = {}
+            with self._caps_lock:
+                for row in keys:
+                    entry = self._caps_cache.get((row["provider"], row["binary_path"]))
+                    if (
+                        entry is not None
+                        and entry[0] == row["id"]
+                        and entry[1].detected_at == row["detected_at"]
+                    ):
+                        self._caps_cache.move_to_end((row["provider"], row["binary_path"]))
+                        results.append(_copy_capability(entry[1]))
+                    else:
+                        missing[row["id"]] = len(results)
+                        results.append(None)
+
+            if missing:
+                placeholders = ", ".join("?" * len(missing))
+                cursor = _query(
+                    conn,
+                    _capability_row,
+                    f"SELECT {_CAPABILITY_COLUMNS} FROM capabilities WHERE id IN ({placeholders})",
+                    tuple(missing),
+                )
+                for capability in cursor.fetchall():
+                    results[missing[capability.id]] = capability
+                    self._cache_capability(capability)
+
+        return [capability for capability in results if capability is not None]
+
+    def _cache_capability(self, capability: Capability) -> None:
+        """Remember a decoded capability, evicting the least recently used."""
+        key = (capability.provider, capability.binary_path)
+        with self._caps_lock:
+            self._caps_cache[key] = (capability.id, _copy_capability(capability))
+            self._caps_cache.move_to_end(key)
+            while len(self._caps_cache) > CAPABILITY_CACHE_SIZE:
+                self._caps_cache.popitem(last=False)
@@ -19,10 +19,10 @@ class TestAnthropicAdapter:
         adapter = AnthropicAdapter()
         assert adapter.display_name == "Anthropic"
 
-    def test_detect_no_api_key(self):
+    def test_detect_no_api_key(self, monkeypatch):
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
         adapter = AnthropicAdapter(api_key=None)
-        with patch.dict("os.environ", {}, clear=True):
-            result = adapter.detect()
+        result = adapter.detect()
         assert result.detected is False
         assert "ANTHROPIC_API_KEY" in result.error
 
@@ -41,10 +41,10 @@ class TestAnthropicAdapter:
         assert "claude-sonnet-4-20250514" in models
         assert "claude-3-haiku-20240307" in models
 
-    def test_run_no_api_key(self):
+    def test_run_no_api_key(self, monkeypatch):
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
         adapter = AnthropicAdapter(api_key=None)
-        with patch.dict("os.environ", {}, clear=True):
-            result = adapter.run("Hello", RunOptions(model="claude-3-haiku"))
+        result = adapter.run("Hello", RunOptions(model="claude-3-haiku"))
         assert result.exit_code == 1
         assert "ANTHROPIC_API_KEY" in result.error
 
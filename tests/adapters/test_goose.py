@@ -4,7 +4,6 @@ from __future__ import annotations
 
 from mrbench.adapters.base import RunOptions
 from mrbench.adapters.goose import GooseAdapter
-from mrbench.core.executor import ExecutorResult
 
 
 def test_goose_adapter_identity() -> None:
@@ -22,19 +21,11 @@ def test_goose_detect_without_binary(monkeypatch) -> None:
     assert result.error == "goose binary not found"
 
 
-def test_goose_detect_with_binary_and_version(monkeypatch) -> None:
+def test_goose_detect_with_binary_and_version(monkeypatch, stub_executor, make_result) -> None:
     adapter = GooseAdapter(binary_path="/bin/goose")
     monkeypatch.setattr(adapter, "_get_binary", lambda: "/bin/goose")
-    monkeypatch.setattr(
-        adapter._executor,
-        "run",
-        lambda _args: ExecutorResult(
-            stdout="goose 1.2.3\n",
-            stderr="",
-            exit_code=0,
-            wall_time_ms=1.0,
-        ),
-    )
+    adapter._executor = stub_executor
+    stub_executor.responses.append(make_result(stdout="goose 1.2.3\n"))
 
     result = adapter.detect()
     assert result.detected is True
@@ -56,46 +47,24 @@ def test_goose_run_without_binary(monkeypatch) -> None:
     assert result.error == "goose not found"
 
 
-def test_goose_run_success_and_error_propagation(monkeypatch) -> None:
+def test_goose_run_success_and_error_propagation(monkeypatch, stub_executor, make_result) -> None:
     adapter = GooseAdapter(binary_path="/bin/goose")
     monkeypatch.setattr(adapter, "_get_binary", lambda: "/bin/goose")
+    adapter._executor = stub_executor
+    stub_executor.responses.extend(
+        [
+            make_result(stdout="ok output", wall_time_ms=5.0),
+            make_result(stderr="boom", exit_code=1, wall_time_ms=3.0),
+        ]
+    )
 
-    calls: list[tuple[list[str], str]] = []
-
-    def _run(
-        args: list[str],
-        prompt: str,
-        cwd: str | None = None,
-        stream_callback: object | None = None,
-        timeout: float | None = None,
-    ) -> ExecutorResult:
-        _ = (cwd, stream_callback, timeout)
-        calls.append((args, prompt))
-        return ExecutorResult(
-            stdout="ok output",
-            stderr="",
-            exit_code=0,
-            wall_time_ms=5.0,
-        )
-
-    monkeypatch.setattr(adapter._executor, "run_with_stdin_prompt", _run)
     success = adapter.run("prompt text", RunOptions(model="ignored"))
 
     assert success.exit_code == 0
     assert success.output == "ok output"
     assert success.error is None
-    assert calls == [(["/bin/goose", "run", "-"], "prompt text")]
-
-    monkeypatch.setattr(
-        adapter._executor,
-        "run_with_stdin_prompt",
-        lambda _args, _prompt, **_kwargs: ExecutorResult(
-            stdout="",
-            stderr="boom",
-            exit_code=1,
-            wall_time_ms=3.0,
-        ),
-    )
+    assert stub_executor.calls == [(["/bin/goose", "run", "-"], "prompt text")]
+
     failure = adapter.run("prompt text", RunOptions(model="ignored"))
     assert failure.exit_code == 1
     assert failure.error == "boom"
@@ -4,16 +4,40 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
+
+from mrbench.adapters import _which as which_module
 from mrbench.adapters import llamacpp as llamacpp_module
 from mrbench.adapters.base import RunOptions
 from mrbench.adapters.llamacpp import LlamaCppAdapter
-from mrbench.core.executor import ExecutorResult
 
 
-def test_llamacpp_adapter_identity() -> None:
-    adapter = LlamaCppAdapter(binary_path="/bin/llama-cli")
-    assert adapter.name == "llamacpp"
-    assert adapter.display_name == "llama.cpp"
+@pytest.fixture(scope="module")
+def models_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Models directory with nested GGUF files, built once per module."""
+    root = tmp_path_factory.mktemp("models")
+    for name in (
+        "alpha.gguf",
+        "exact.gguf",
+        "ignore.txt",
+        "nested/beta.gguf",
+        "sub/prefix-target-suffix.gguf",
+    ):
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+    return root
+
+
+@pytest.fixture(scope="module")
+def llamacpp() -> LlamaCppAdapter:
+    """Shared adapter for tests that only call side-effect-free methods."""
+    return LlamaCppAdapter()
+
+
+def test_llamacpp_adapter_identity(llamacpp: LlamaCppAdapter) -> None:
+    assert llamacpp.name == "llamacpp"
+    assert llamacpp.display_name == "llama.cpp"
 
 
 def test_get_binary_prefers_explicit_path() -> None:
@@ -27,14 +51,14 @@ def test_get_binary_resolves_first_available_binary(monkeypatch) -> None:
         "llama-server": "/bin/llama-server",
         "main": "/bin/main",
     }
-    monkeypatch.setattr(llamacpp_module.shutil, "which", lambda name: mapping.get(name))
+    monkeypatch.setattr(which_module.shutil, "which", lambda name, path=None: mapping.get(name))
 
     adapter = LlamaCppAdapter()
     assert adapter._get_binary() == "/bin/llama-server"
 
 
 def test_get_binary_returns_none_when_not_found(monkeypatch) -> None:
-    monkeypatch.setattr(llamacpp_module.shutil, "which", lambda _name: None)
+    monkeypatch.setattr(which_module.shutil, "which", lambda _name, path=None: None)
     adapter = LlamaCppAdapter()
     assert adapter._get_binary() is None
 
@@ -66,19 +90,11 @@ def test_detect_returns_not_detected_without_binary(monkeypatch) -> None:
     assert result.error == "llama.cpp binary not found"
 
 
-def test_detect_reads_version_on_success(monkeypatch) -> None:
+def test_detect_reads_version_on_success(monkeypatch, stub_executor, make_result) -> None:
     adapter = LlamaCppAdapter(binary_path="/bin/llama-cli")
     monkeypatch.setattr(adapter, "_get_binary", lambda: "/bin/llama-cli")
-    monkeypatch.setattr(
-        adapter._executor,
-        "run",
-        lambda _args: ExecutorResult(
-            stdout="llama.cpp build 123\n",
-            stderr="",
-            exit_code=0,
-            wall_time_ms=1.0,
-        ),
-    )
+    adapter._executor = stub_executor
+    stub_executor.responses.append(make_result(stdout="llama.cpp build 123\n"))
 
     result = adapter.detect()
 
@@ -88,19 +104,13 @@ def test_detect_reads_version_on_success(monkeypatch) -> None:
     assert result.auth_status == "authenticated"
 
 
-def test_detect_sets_version_none_on_executor_failure(monkeypatch) -> None:
+def test_detect_sets_version_none_on_executor_failure(
+    monkeypatch, stub_executor, make_result
+) -> None:
     adapter = LlamaCppAdapter(binary_path="/bin/llama-cli")
     monkeypatch.setattr(adapter, "_get_binary", lambda: "/bin/llama-cli")
-    monkeypatch.setattr(
-        adapter._executor,
-        "run",
-        lambda _args: ExecutorResult(
-            stdout="",
-            stderr="failed",
-            exit_code=1,
-            wall_time_ms=1.0,
-        ),
-    )
+    adapter._executor = stub_executor
+    stub_executor.responses.append(make_result(stderr="failed", exit_code=1))
 
     result = adapter.detect()
 
@@ -108,18 +118,12 @@ def test_detect_sets_version_none_on_executor_failure(monkeypatch) -> None:
     assert result.version is None
 
 
-def test_list_models_returns_gguf_stems(monkeypatch, tmp_path: Path) -> None:
-    models_dir = tmp_path / "models"
-    (models_dir / "nested").mkdir(parents=True)
-    (models_dir / "alpha.gguf").write_text("a")
-    (models_dir / "nested" / "beta.gguf").write_text("b")
-    (models_dir / "ignore.txt").write_text("x")
-
+def test_list_models_returns_gguf_stems(monkeypatch, models_dir: Path) -> None:
     adapter = LlamaCppAdapter()
     monkeypatch.setattr(adapter, "_get_models_dir", lambda: models_dir)
 
     models = adapter.list_models()
-    assert set(models) == {"alpha", "beta"}
+    assert set(models) == {"alpha", "exact", "beta", "prefix-target-suffix"}
 
 
 def test_list_models_returns_empty_when_models_dir_missing(monkeypatch) -> None:
@@ -147,19 +151,12 @@ def test_run_returns_error_when_model_missing(monkeypatch) -> None:
     assert result.error == "Model not found: missing-model"
 
 
-def test_find_model_exact_glob_and_missing(monkeypatch, tmp_path: Path) -> None:
-    models_dir = tmp_path / "models"
-    (models_dir / "sub").mkdir(parents=True)
-    exact = models_dir / "exact.gguf"
-    glob_match = models_dir / "sub" / "prefix-target-suffix.gguf"
-    exact.write_text("x")
-    glob_match.write_text("y")
-
+def test_find_model_exact_glob_and_missing(monkeypatch, models_dir: Path) -> None:
     adapter = LlamaCppAdapter()
     monkeypatch.setattr(adapter, "_get_models_dir", lambda: models_dir)
 
-    assert adapter._find_model("exact") == exact
-    assert adapter._find_model("target") == glob_match
+    assert adapter._find_model("exact") == models_dir / "exact.gguf"
+    assert adapter._find_model("target") == models_dir / "sub" / "prefix-target-suffix.gguf"
     assert adapter._find_model("missing") is None
 
 
@@ -169,8 +166,8 @@ def test_find_model_returns_none_without_models_dir(monkeypatch) -> None:
     assert adapter._find_model("anything") is None
 
 
-def test_llamacpp_capabilities() -> None:
-    caps = LlamaCppAdapter().get_capabilities()
+def test_llamacpp_capabilities(llamacpp: LlamaCppAdapter) -> None:
+    caps = llamacpp.get_capabilities()
     assert caps.name == "llamacpp"
     assert caps.streaming is True
     assert caps.tool_calling is False
@@ -2,27 +2,34 @@
 
 from __future__ import annotations
 
+import pytest
+
 from mrbench.adapters.base import RunOptions
 from mrbench.adapters.ollama import OllamaAdapter
 from mrbench.core.executor import ExecutorResult
 
 
-def test_ollama_adapter_identity() -> None:
-    adapter = OllamaAdapter(binary_path="/bin/ollama")
-    assert adapter.name == "ollama"
-    assert adapter.display_name == "Ollama"
+@pytest.fixture(scope="module")
+def ollama() -> OllamaAdapter:
+    """Shared adapter for tests that only call side-effect-free methods."""
+    return OllamaAdapter()
+
+
+def test_ollama_adapter_identity(ollama: OllamaAdapter) -> None:
+    assert ollama.name == "ollama"
+    assert ollama.display_name == "Ollama"
 
 
 def test_get_binary_uses_cache(monkeypatch) -> None:
     calls = {"count": 0}
 
-    def _which(name: str) -> str | None:
+    def _which(name: str, path: str | None = None) -> str | None:
         calls["count"] += 1
         return "/bin/ollama" if name == "ollama" else None
 
-    from mrbench.adapters import ollama as ollama_module
+    from mrbench.adapters import _which as which_module
 
-    monkeypatch.setattr(ollama_module.shutil, "which", _which)
+    monkeypatch.setattr(which_module.shutil, "which", _which)
     adapter = OllamaAdapter()
 
     assert adapter._get_binary() == "/bin/ollama"
@@ -39,19 +46,14 @@ def test_run_command_returns_127_when_binary_missing(monkeypatch) -> None:
     assert result.stderr == "ollama binary not found"
 
 
-def test_run_version_check_parsing_variants(monkeypatch) -> None:
+def test_run_version_check_parsing_variants(monkeypatch, make_result) -> None:
     adapter = OllamaAdapter(binary_path="/bin/ollama")
 
     # Standard "ollama version X.Y.Z" output.
     monkeypatch.setattr(
         adapter,
         "_run_command",
-        lambda _args: ExecutorResult(
-            stdout="ollama version 0.4.1\n",
-            stderr="",
-            exit_code=0,
-            wall_time_ms=1.0,
-        ),
+        lambda _args: make_result(stdout="ollama version 0.4.1\n"),
     )
     assert adapter._run_version_check() == "0.4.1"
 
@@ -59,12 +61,7 @@ def test_run_version_check_parsing_variants(monkeypatch) -> None:
     monkeypatch.setattr(
         adapter,
         "_run_command",
-        lambda _args: ExecutorResult(
-            stdout="custom-build-string\n",
-            stderr="",
-            exit_code=0,
-            wall_time_ms=1.0,
-        ),
+        lambda _args: make_result(stdout="custom-build-string\n"),
     )
     assert adapter._run_version_check() == "custom-build-string"
 
@@ -72,12 +69,7 @@ def test_run_version_check_parsing_variants(monkeypatch) -> None:
     monkeypatch.setattr(
         adapter,
         "_run_command",
-        lambda _args: ExecutorResult(
-            stdout="",
-            stderr="failed",
-            exit_code=1,
-            wall_time_ms=1.0,
-        ),
+        lambda _args: make_result(stderr="failed", exit_code=1),
     )
     assert adapter._run_version_check() is None
 
@@ -91,7 +83,7 @@ def test_detect_without_binary(monkeypatch) -> None:
     assert result.error == "ollama binary not found in PATH"
 
 
-def test_detect_sets_auth_unknown_when_list_fails(monkeypatch) -> None:
+def test_detect_sets_auth_unknown_when_list_fails(monkeypatch, make_result) -> None:
     adapter = OllamaAdapter(binary_path="/tmp/ollama")
     monkeypatch.setattr(adapter, "_get_binary", lambda: "/tmp/ollama")
     monkeypatch.setattr(adapter, "_run_version_check", lambda: "0.5.0")
@@ -99,8 +91,8 @@ def test_detect_sets_auth_unknown_when_list_fails(monkeypatch) -> None:
     def _run_command(args: list[str], stdin: str | None = None) -> ExecutorResult:
         _ = stdin
         if args == ["list"]:
-            return ExecutorResult(stdout="", stderr="not running", exit_code=1, wall_time_ms=1.0)
-        return ExecutorResult(stdout="", stderr="", exit_code=0, wall_time_ms=1.0)
+            return make_result(stderr="not running", exit_code=1)
+        return make_result()
 
     monkeypatch.setattr(adapter, "_run_command", _run_command)
 
@@ -112,41 +104,45 @@ def test_detect_sets_auth_unknown_when_list_fails(monkeypatch) -> None:
     assert result.trusted is False
 
 
-def test_list_models_returns_empty_on_error(monkeypatch) -> None:
+def test_list_models_returns_empty_on_error(monkeypatch, make_result) -> None:
     adapter = OllamaAdapter()
     monkeypatch.setattr(
         adapter,
         "_run_command",
-        lambda _args, stdin=None: ExecutorResult(
-            stdout="",
-            stderr="error",
-            exit_code=1,
-            wall_time_ms=1.0,
-        ),
+        lambda _args, stdin=None: make_result(stderr="error", exit_code=1),
     )
 
     assert adapter.list_models() == []
 
 
-def test_list_models_parses_model_names(monkeypatch) -> None:
+@pytest.mark.parametrize(
+    ("stdout", "expected"),
+    [
+        (
+            "NAME ID SIZE MODIFIED\n"
+            "llama3.2 abc123 4.7 GB 2 days ago\n"
+            "mistral def456 4.1 GB 1 day ago\n",
+            ["llama3.2", "mistral"],
+        ),
+        ("NAME ID SIZE MODIFIED\n", []),
+        ("", []),
+        (
+            "NAME\tID\tSIZE\tMODIFIED\r\n\r\n  qwen2:7b\tfff000\t4.4 GB\tnow\r\n   \n",
+            ["qwen2:7b"],
+        ),
+    ],
+)
+def test_list_models_parses_model_names(
+    monkeypatch, stdout: str, expected: list[str], make_result
+) -> None:
     adapter = OllamaAdapter()
-    output = (
-        "NAME ID SIZE MODIFIED\n"
-        "llama3.2 abc123 4.7 GB 2 days ago\n"
-        "mistral def456 4.1 GB 1 day ago\n"
-    )
     monkeypatch.setattr(
         adapter,
         "_run_command",
-        lambda _args, stdin=None: ExecutorResult(
-            stdout=output,
-            stderr="",
-            exit_code=0,
-            wall_time_ms=1.0,
-        ),
+        lambda _args, stdin=None: make_result(stdout=stdout),
     )
 
-    assert adapter.list_models() == ["llama3.2", "mistral"]
+    assert adapter.list_models() == expected
 
 
 def test_run_without_binary_returns_127(monkeypatch) -> None:
@@ -158,44 +154,26 @@ def test_run_without_binary_returns_127(monkeypatch) -> None:
     assert result.error == "ollama not found"
 
 
-def test_run_stream_path_uses_executor_run(monkeypatch) -> None:
+def test_run_stream_path_uses_executor_run(monkeypatch, stub_executor, make_result) -> None:
     adapter = OllamaAdapter(binary_path="/bin/ollama")
     monkeypatch.setattr(adapter, "_get_binary", lambda: "/bin/ollama")
-
-    calls: list[tuple[list[str], str]] = []
-
-    def _run(
-        args: list[str],
-        stdin: str | None = None,
-        cwd: str | None = None,
-        stream_callback: object | None = None,
-        timeout: float | None = None,
-    ) -> ExecutorResult:
-        _ = (cwd, stream_callback, timeout)
-        calls.append((args, stdin or ""))
-        return ExecutorResult(
-            stdout="streamed",
-            stderr="",
-            exit_code=0,
-            wall_time_ms=10.0,
-            ttft_ms=2.5,
-            chunks=["a", "b"],
-        )
-
-    monkeypatch.setattr(adapter._executor, "run", _run)
+    adapter._executor = stub_executor
+    stub_executor.responses.append(
+        make_result(stdout="streamed", wall_time_ms=10.0, ttft_ms=2.5, chunks=["a", "b"])
+    )
 
     result = adapter.run(
         "prompt text",
         RunOptions(model="llama3.2", stream=True, stream_callback=lambda _chunk: None),
     )
-    assert calls == [(["/bin/ollama", "run", "llama3.2"], "prompt text")]
+    assert stub_executor.calls == [(["/bin/ollama", "run", "llama3.2"], "prompt text")]
     assert result.output == "streamed"
     assert result.ttft_ms == 2.5
     assert result.chunks == ["a", "b"]
 
 
-def test_ollama_capabilities() -> None:
-    caps = OllamaAdapter().get_capabilities()
+def test_ollama_capabilities(ollama: OllamaAdapter) -> None:
+    caps = ollama.get_capabilities()
     assert caps.name == "ollama"
     assert caps.streaming is True
     assert caps.offline is True
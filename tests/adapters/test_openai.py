@@ -2,27 +2,40 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+import pytest
 
 from mrbench.adapters.base import RunOptions
 from mrbench.adapters.openai import OpenAIAdapter
 
 
+def _fake_client(create: Any) -> SimpleNamespace:
+    """Build a minimal stand-in for ``openai.OpenAI`` exposing ``chat.completions.create``."""
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+@pytest.fixture(scope="module")
+def openai_adapter() -> OpenAIAdapter:
+    """Shared adapter for tests that only call side-effect-free methods."""
+    return OpenAIAdapter()
+
+
 class TestOpenAIAdapter:
     """Test OpenAI adapter."""
 
-    def test_adapter_name(self):
-        adapter = OpenAIAdapter()
-        assert adapter.name == "openai"
+    def test_adapter_name(self, openai_adapter: OpenAIAdapter):
+        assert openai_adapter.name == "openai"
 
-    def test_adapter_display_name(self):
-        adapter = OpenAIAdapter()
-        assert adapter.display_name == "OpenAI"
+    def test_adapter_display_name(self, openai_adapter: OpenAIAdapter):
+        assert openai_adapter.display_name == "OpenAI"
 
-    def test_detect_no_api_key(self):
+    def test_detect_no_api_key(self, monkeypatch):
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
         adapter = OpenAIAdapter(api_key=None)
-        with patch.dict("os.environ", {}, clear=True):
-            result = adapter.detect()
+        result = adapter.detect()
         assert result.detected is False
         assert "OPENAI_API_KEY" in result.error
 
@@ -43,21 +56,22 @@ class TestOpenAIAdapter:
         assert "gpt-4o" in models
         assert "gpt-4o-mini" in models
 
-    def test_run_no_api_key(self):
+    def test_run_no_api_key(self, monkeypatch):
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
         adapter = OpenAIAdapter(api_key=None)
-        with patch.dict("os.environ", {}, clear=True):
-            result = adapter.run("Hello", RunOptions(model="gpt-4o-mini"))
+        result = adapter.run("Hello", RunOptions(model="gpt-4o-mini"))
         assert result.exit_code == 1
         assert "OPENAI_API_KEY" in result.error
 
     def test_run_success(self):
         adapter = OpenAIAdapter(api_key="sk-test")
 
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock(message=MagicMock(content="Hello, world!"))]
+        response = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="Hello, world!"))]
+        )
+        client = _fake_client(lambda **_kwargs: response)
 
-        with patch.object(adapter, "_get_client") as mock_client:
-            mock_client.return_value.chat.completions.create.return_value = mock_response
+        with patch.object(adapter, "_get_client", return_value=client):
             result = adapter.run("Say hello", RunOptions(model="gpt-4o-mini"))
 
         assert result.exit_code == 0
@@ -67,18 +81,17 @@ class TestOpenAIAdapter:
     def test_run_api_error(self):
         adapter = OpenAIAdapter(api_key="sk-test")
 
-        with patch.object(adapter, "_get_client") as mock_client:
-            mock_client.return_value.chat.completions.create.side_effect = Exception(
-                "Rate limit exceeded"
-            )
+        def _create(**_kwargs: Any) -> None:
+            raise Exception("Rate limit exceeded")
+
+        with patch.object(adapter, "_get_client", return_value=_fake_client(_create)):
             result = adapter.run("Hello", RunOptions(model="gpt-4o-mini"))
 
         assert result.exit_code == 1
         assert "Rate limit exceeded" in result.error
 
-    def test_capabilities(self):
-        adapter = OpenAIAdapter()
-        caps = adapter.get_capabilities()
+    def test_capabilities(self, openai_adapter: OpenAIAdapter):
+        caps = openai_adapter.get_capabilities()
         assert caps.name == "openai"
         assert caps.streaming is True
         assert caps.tool_calling is True
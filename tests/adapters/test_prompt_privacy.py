@@ -6,6 +6,7 @@ These tests ensure prompt text is never passed as a command-line argument.
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Any
 
 import pytest
 
@@ -56,27 +57,32 @@ class SpyExecutor:
         return ExecutorResult(stdout="ok", stderr="", exit_code=0, wall_time_ms=1.0)
 
 
+@pytest.fixture(scope="module")
+def adapters() -> dict[str, tuple[Any, str]]:
+    """Build each argv-sensitive adapter once, keyed by name, with a model to run."""
+    return {
+        "claude": (ClaudeAdapter(binary_path="/bin/claude"), "claude-3-5-sonnet"),
+        "codex": (CodexAdapter(binary_path="/bin/codex"), "o4-mini"),
+        "gemini": (GeminiAdapter(binary_path="/bin/gemini"), "gemini-2.5-pro"),
+        "goose": (GooseAdapter(binary_path="/bin/goose"), "default"),
+        "ollama": (OllamaAdapter(binary_path="/bin/ollama"), "llama3.2"),
+        "opencode": (OpenCodeAdapter(binary_path="/bin/opencode"), "default"),
+        "vllm": (VllmAdapter(binary_path="/bin/vllm"), "meta-llama/Llama-2-7b-chat-hf"),
+    }
+
+
 @pytest.mark.parametrize(
-    ("adapter", "model"),
-    [
-        (ClaudeAdapter(binary_path="/bin/claude"), "claude-3-5-sonnet"),
-        (CodexAdapter(binary_path="/bin/codex"), "o4-mini"),
-        (GeminiAdapter(binary_path="/bin/gemini"), "gemini-2.5-pro"),
-        (GooseAdapter(binary_path="/bin/goose"), "default"),
-        (OllamaAdapter(binary_path="/bin/ollama"), "llama3.2"),
-        (OpenCodeAdapter(binary_path="/bin/opencode"), "default"),
-        (VllmAdapter(binary_path="/bin/vllm"), "meta-llama/Llama-2-7b-chat-hf"),
-    ],
+    "name", ["claude", "codex", "gemini", "goose", "ollama", "opencode", "vllm"]
 )
-def test_adapter_run_keeps_prompt_out_of_argv(adapter: object, model: str) -> None:
+def test_adapter_run_keeps_prompt_out_of_argv(
+    adapters: dict[str, tuple[Any, str]], name: str
+) -> None:
     prompt = "TOP-SECRET: this prompt must never appear in argv"
+    adapter, model = adapters[name]
     spy = SpyExecutor()
-    adapter._executor = spy  # type: ignore[attr-defined]
+    adapter._executor = spy
 
-    result = adapter.run(
-        prompt,
-        RunOptions(model=model, timeout=42.5),
-    )  # type: ignore[attr-defined]
+    result = adapter.run(prompt, RunOptions(model=model, timeout=42.5))
 
     assert result.exit_code == 0
     assert all(prompt not in arg for arg in spy.last_args)
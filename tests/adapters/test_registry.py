@@ -70,13 +70,8 @@ def test_registry_get_available_filters_by_adapter_availability() -> None:
     assert adapters == [available]
 
 
-def test_default_registry_singleton_and_reset() -> None:
-    reset_default_registry()
-    first = get_default_registry()
-    second = get_default_registry()
-
-    assert first is second
-    names = first.list_names()
+def test_default_registry_lists_builtin_adapters(warm_registry: AdapterRegistry) -> None:
+    names = warm_registry.list_names()
     # Core built-ins are always present.
     assert "fake" in names
     assert "ollama" in names
@@ -88,6 +83,13 @@ def test_default_registry_singleton_and_reset() -> None:
     assert "llamacpp" in names
     assert "vllm" in names
 
+
+def test_default_registry_singleton_and_reset() -> None:
+    reset_default_registry()
+    first = get_default_registry()
+    second = get_default_registry()
+    assert first is second
+
     reset_default_registry()
     third = get_default_registry()
     assert third is not first
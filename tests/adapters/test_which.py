@@ -0,0 +1,56 @@
+"""Tests for the cached PATH lookup used by adapters."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from mrbench.adapters import _which as which_module
+from mrbench.adapters._which import cached_which, clear_which_cache
+from mrbench.adapters.registry import reset_default_registry
+
+
+@pytest.fixture
+def counting_which(monkeypatch: pytest.MonkeyPatch) -> dict[str, Any]:
+    calls: dict[str, Any] = {"count": 0, "paths": []}
+
+    def _which(name: str, path: str | None = None) -> str | None:
+        calls["count"] += 1
+        calls["paths"].append(path)
+        return f"/bin/{name}"
+
+    monkeypatch.setattr(which_module.shutil, "which", _which)
+    return calls
+
+
+def test_cached_which_hits_path_once(counting_which: dict[str, Any]) -> None:
+    assert cached_which("claude") == "/bin/claude"
+    assert cached_which("claude") == "/bin/claude"
+    assert counting_which["count"] == 1
+
+    cached_which("codex")
+    assert counting_which["count"] == 2
+
+
+def test_cached_which_rechecks_when_path_changes(
+    counting_which: dict[str, Any], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("PATH", "/opt/first")
+    cached_which("claude")
+    monkeypatch.setenv("PATH", "/opt/other")
+    cached_which("claude")
+    assert counting_which["count"] == 2
+    # Each lookup searches the PATH it is cached under
+    assert counting_which["paths"] == ["/opt/first", "/opt/other"]
+
+
+def test_cache_cleared_explicitly_and_on_registry_reset(
+    counting_which: dict[str, Any],
+) -> None:
+    cached_which("claude")
+    clear_which_cache()
+    cached_which("claude")
+    reset_default_registry()
+    cached_which("claude")
+    assert counting_which["count"] == 3
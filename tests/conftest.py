@@ -1,14 +1,69 @@
 """Test configuration for mrbench."""
 
+import functools
+from collections import deque
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
 import pytest
 
+from mrbench.adapters._which import clear_which_cache
+from mrbench.adapters.registry import AdapterRegistry, get_default_registry
+from mrbench.core.executor import ExecutorResult
+from mrbench.core.storage import DEFAULT_PRAGMAS, Storage
 
-@pytest.fixture
-def tmp_config(tmp_path: Path) -> Path:
-    """Create a temporary config file."""
-    config_file = tmp_path / "config.toml"
+
+def make_result(**overrides: Any) -> ExecutorResult:
+    """Build a successful ``ExecutorResult``, overriding only the fields a test cares about."""
+    fields: dict[str, Any] = {"stdout": "", "stderr": "", "exit_code": 0, "wall_time_ms": 1.0}
+    fields.update(overrides)
+    return ExecutorResult(**fields)
+
+
+@dataclass
+class StubExecutor:
+    """Executor stand-in that replays queued results and records calls.
+
+    Each call pops the next entry from ``responses``; ``calls`` keeps the
+    ``(args, stdin)`` pair of every invocation in order.
+    """
+
+    responses: deque[ExecutorResult] = field(default_factory=deque)
+    calls: list[tuple[list[str], str | None]] = field(default_factory=list)
+
+    def run(
+        self,
+        args: list[str],
+        stdin: str | None = None,
+        cwd: str | None = None,
+        stream_callback: Callable[[str], None] | None = None,
+        timeout: float | None = None,
+    ) -> ExecutorResult:
+        _ = (cwd, stream_callback, timeout)
+        self.calls.append((args, stdin))
+        return self.responses.popleft()
+
+    def run_with_stdin_prompt(
+        self,
+        args: list[str],
+        prompt: str,
+        cwd: str | None = None,
+        stream_callback: Callable[[str], None] | None = None,
+        timeout: float | None = None,
+    ) -> ExecutorResult:
+        return self.run(args, prompt, cwd, stream_callback, timeout)
+
+
+@pytest.fixture(scope="session")
+def tmp_config(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a temporary config file, written once per session.
+
+    The contents are static; tests that need to modify the file should
+    copy it into their own ``tmp_path`` first.
+    """
+    config_file = tmp_path_factory.mktemp("cfg") / "config.toml"
     config_file.write_text("""
 [general]
 timeout = 600
@@ -23,5 +78,73 @@ preference_order = ["fake", "ollama"]
 
 @pytest.fixture
 def tmp_db(tmp_path: Path) -> Path:
-    """Create a temporary database path."""
+    """Create a temporary database path.
+
+    Function-scoped on purpose: a database is written to, so sharing one
+    path across tests would leak rows between them.
+    """
     return tmp_path / "test.db"
+
+
+# Test databases are thrown away, so durability buys nothing: skip the fsyncs.
+# journal_mode stays WAL because Storage's reader pool reads alongside the writer.
+EPHEMERAL_PRAGMAS: dict[str, str | int] = {**DEFAULT_PRAGMAS, "synchronous": "OFF"}
+
+
+@pytest.fixture
+def fast_storage(tmp_db: Path) -> Iterator[Storage]:
+    """Provide a fresh Storage tuned for throwaway test databases."""
+    storage = Storage(tmp_db, pragmas=EPHEMERAL_PRAGMAS)
+    yield storage
+    storage.close()
+
+
+@pytest.fixture(scope="class")
+def shared_storage(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Storage]:
+    """Provide one migrated database shared by every test in a class.
+
+    The schema is created once per class rather than once per test, so
+    tests using it must only look up rows by the run and job ids they
+    created themselves.
+    """
+    storage = Storage(tmp_path_factory.mktemp("db") / "shared.db", pragmas=EPHEMERAL_PRAGMAS)
+    yield storage
+    storage.close()
+
+
+@pytest.fixture(scope="class")
+def open_shared_storage(shared_storage: Storage) -> Callable[[], Storage]:
+    """Factory for extra Storage handles on the ``shared_storage`` database.
+
+    Patch this in for code under test that opens and closes its own Storage,
+    so closing that handle leaves the class-shared instance untouched.
+    """
+    return functools.partial(Storage, shared_storage.db_path, pragmas=EPHEMERAL_PRAGMAS)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_which_cache() -> None:
+    """Start every test without PATH lookups cached by an earlier one."""
+    clear_which_cache()
+
+
+@pytest.fixture
+def stub_executor() -> StubExecutor:
+    """Provide an executor that returns queued results instead of spawning."""
+    return StubExecutor()
+
+
+@pytest.fixture(scope="session")
+def warm_registry() -> AdapterRegistry:
+    """Build the default registry once for tests that only read from it.
+
+    Tests that reset the default registry must not rely on this object
+    still being the process-wide singleton.
+    """
+    return get_default_registry()
+
+
+@pytest.fixture(name="make_result")
+def make_result_fixture() -> Callable[..., ExecutorResult]:
+    """Expose :func:`make_result` to tests without importing conftest."""
+    return make_result
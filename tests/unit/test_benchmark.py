@@ -2,6 +2,7 @@
 
 from pathlib import Path
 
+import pytest
 import yaml
 
 from mrbench.adapters.base import (
@@ -12,7 +13,13 @@ from mrbench.adapters.base import (
     RunResult,
 )
 from mrbench.adapters.registry import AdapterRegistry
-from mrbench.core.benchmark import BenchmarkOrchestrator, BenchmarkPrompt, BenchmarkSuite
+from mrbench.core import benchmark as benchmark_module
+from mrbench.core.benchmark import (
+    BenchmarkOrchestrator,
+    BenchmarkPrompt,
+    BenchmarkSuite,
+    load_suite,
+)
 from mrbench.core.storage import Storage
 
 
@@ -59,6 +66,20 @@ prompts:
     assert suite.name == "mysuite"  # Uses filename
 
 
+@pytest.mark.parametrize("loader", ["fast", "pure-python"])
+def test_load_suite_rejects_unsafe_tags(tmp_path: Path, monkeypatch, loader: str):
+    if loader == "pure-python":
+        monkeypatch.setattr(benchmark_module, "_SuiteLoader", yaml.SafeLoader)
+    suite_file = tmp_path / "unsafe.yaml"
+    suite_file.write_text("name: !!python/object/apply:os.getcwd []\n")
+
+    with pytest.raises(yaml.YAMLError):
+        load_suite(suite_file)
+
+    suite_file.write_text("name: ok\nprompts: [{id: p1, text: hi}]\n")
+    assert load_suite(suite_file) == {"name": "ok", "prompts": [{"id": "p1", "text": "hi"}]}
+
+
 def test_hobbyist_anthropic_baseline_profile():
     suite_file = Path(__file__).resolve().parents[2] / "suites" / "hobbyist_anthropic_baseline.yaml"
     suite_data = yaml.safe_load(suite_file.read_text())
@@ -98,23 +119,22 @@ class _ZeroMetricAdapter(Adapter):
         return AdapterCapabilities(name=self.name, offline=True)
 
 
-def test_orchestrator_persists_zero_value_metrics(tmp_path: Path):
+def test_orchestrator_persists_zero_value_metrics(fast_storage: Storage):
     registry = AdapterRegistry()
     registry.register(_ZeroMetricAdapter())
-    with Storage(tmp_path / "metrics.db") as storage:
-        orchestrator = BenchmarkOrchestrator(registry=registry, storage=storage)
+    orchestrator = BenchmarkOrchestrator(registry=registry, storage=fast_storage)
 
-        suite = BenchmarkSuite(
-            name="zero-metric-suite",
-            description="",
-            prompts=[BenchmarkPrompt(id="p1", text="hello")],
-        )
-        run = orchestrator.run_suite(suite)
+    suite = BenchmarkSuite(
+        name="zero-metric-suite",
+        description="",
+        prompts=[BenchmarkPrompt(id="p1", text="hello")],
+    )
+    run = orchestrator.run_suite(suite)
 
-        jobs = storage.get_jobs_for_run(run.run_id)
-        assert len(jobs) == 1
-        metrics = {m.metric_name: m.metric_value for m in storage.get_job_metrics(jobs[0].id)}
+    jobs = fast_storage.get_jobs_for_run(run.run_id)
+    assert len(jobs) == 1
+    metrics = {m.metric_name: m.metric_value for m in fast_storage.get_job_metrics(jobs[0].id)}
 
-        assert metrics["wall_time_ms"] == 1.0
-        assert metrics["ttft_ms"] == 0.0
-        assert metrics["output_tokens"] == 0.0
+    assert metrics["wall_time_ms"] == 1.0
+    assert metrics["ttft_ms"] == 0.0
+    assert metrics["output_tokens"] == 0.0
@@ -9,7 +9,9 @@ from mrbench.core.discovery import ConfigCheckResult, ConfigDetector
 from mrbench.core.executor import ExecutorResult
 
 
-def test_discover_cli_tools_skips_auth_checks_by_default(monkeypatch, tmp_path: Path) -> None:
+def test_discover_cli_tools_skips_auth_checks_by_default(
+    monkeypatch, tmp_path: Path, make_result
+) -> None:
     config_dir = tmp_path / "codex-config"
     config_dir.mkdir()
 
@@ -25,7 +27,7 @@ def test_discover_cli_tools_skips_auth_checks_by_default(monkeypatch, tmp_path:
 
     def fake_run(args: list[str], **kwargs: object) -> ExecutorResult:
         calls.append(args)
-        return ExecutorResult(stdout="ok", stderr="", exit_code=0, wall_time_ms=1.0)
+        return make_result(stdout="ok")
 
     detector = ConfigDetector()
     detector._executor.run = fake_run  # type: ignore[method-assign]
@@ -37,7 +39,9 @@ def test_discover_cli_tools_skips_auth_checks_by_default(monkeypatch, tmp_path:
     assert results["ready"] == []
 
 
-def test_discover_cli_tools_runs_auth_checks_when_enabled(monkeypatch, tmp_path: Path) -> None:
+def test_discover_cli_tools_runs_auth_checks_when_enabled(
+    monkeypatch, tmp_path: Path, make_result
+) -> None:
     config_dir = tmp_path / "codex-config"
     config_dir.mkdir()
 
@@ -53,7 +57,7 @@ def test_discover_cli_tools_runs_auth_checks_when_enabled(monkeypatch, tmp_path:
 
     def fake_run(args: list[str], **kwargs: object) -> ExecutorResult:
         calls.append(args)
-        return ExecutorResult(stdout="ok", stderr="", exit_code=0, wall_time_ms=1.0)
+        return make_result(stdout="ok")
 
     detector = ConfigDetector()
     detector._executor.run = fake_run  # type: ignore[method-assign]
@@ -87,7 +91,9 @@ def test_check_provider_resolves_binary_alias_for_azure(monkeypatch, tmp_path: P
     assert result.config_path == str(config_dir)
 
 
-def test_discover_az_binary_uses_azure_config_and_auth(monkeypatch, tmp_path: Path) -> None:
+def test_discover_az_binary_uses_azure_config_and_auth(
+    monkeypatch, tmp_path: Path, make_result
+) -> None:
     config_dir = tmp_path / "azure-config"
     config_dir.mkdir()
 
@@ -105,7 +111,7 @@ def test_discover_az_binary_uses_azure_config_and_auth(monkeypatch, tmp_path: Pa
 
     def fake_run(args: list[str], **kwargs: object) -> ExecutorResult:
         calls.append(args)
-        return ExecutorResult(stdout="ok", stderr="", exit_code=0, wall_time_ms=1.0)
+        return make_result(stdout="ok")
 
     detector = ConfigDetector()
     detector._executor.run = fake_run  # type: ignore[method-assign]
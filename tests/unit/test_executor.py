@@ -149,3 +149,168 @@ def test_run_with_stdin_prompt_honors_timeout_override():
 
     assert result.timed_out is True
     assert result.exit_code != 0
+
+
+def test_line_splitter_holds_partial_lines_and_split_utf8():
+    splitter = executor_module._LineSplitter()
+    encoded = "héllo\nwor".encode()
+
+    assert splitter.feed(encoded[:2]) == ""
+    assert splitter.feed(encoded[2:]) == "héllo\n"
+    assert splitter.feed(b"ld\n") == "world\n"
+    assert splitter.feed(b"tail") == ""
+    assert splitter.feed(b"") == "tail"
+
+
+def test_run_streaming_records_ttft_before_newline():
+    code = (
+        "import sys,time; "
+        "sys.stdout.write('tok'); sys.stdout.flush(); "
+        "time.sleep(0.2); "
+        "print('en', flush=True)"
+    )
+    chunks: list[str] = []
+    executor = SubprocessExecutor(timeout=2.0)
+
+    result = executor.run(_python_cmd(code), stream_callback=chunks.append)
+
+    assert result.exit_code == 0
+    assert result.ttft_ms is not None
+    assert result.ttft_ms < result.wall_time_ms - 100
+    assert "".join(chunks) == "token\n"
+    assert result.stdout == "token\n"
+
+
+def test_env_is_cached_until_refreshed(monkeypatch):
+    code = "import os; print(os.getenv('MRBENCH_LATE_ENV', 'missing'))"
+    monkeypatch.delenv("MRBENCH_LATE_ENV", raising=False)
+    executor = SubprocessExecutor(timeout=2.0)
+    monkeypatch.setenv("MRBENCH_LATE_ENV", "late")
+
+    assert executor.run(_python_cmd(code)).stdout.strip() == "missing"
+
+    executor.refresh_env()
+    assert executor.run(_python_cmd(code)).stdout.strip() == "late"
+
+
+def test_run_decodes_utf8_and_translates_newlines():
+    code = "import sys; sys.stdout.buffer.write('caf\\u00e9\\r\\nnext\\rlast'.encode())"
+    executor = SubprocessExecutor(timeout=2.0)
+
+    result = executor.run(_python_cmd(code))
+    streamed = executor.run(_python_cmd(code), stream_callback=lambda _chunk: None)
+
+    assert result.stdout == "café\nnext\nlast"
+    assert streamed.stdout == "café\nnext\nlast"
+
+
+def test_run_streaming_falls_back_to_selectors_without_epoll(monkeypatch):
+    monkeypatch.delattr(executor_module.select, "epoll", raising=False)
+    chunks: list[str] = []
+    executor = SubprocessExecutor(timeout=2.0)
+
+    result = executor.run(
+        _python_cmd("print('one', flush=True); print('two', flush=True)"),
+        stream_callback=chunks.append,
+    )
+
+    assert result.exit_code == 0
+    assert "".join(chunks) == "one\ntwo\n"
+
+
+def test_run_streaming_timeout_keeps_partial_output():
+    code = "import time; print('partial', flush=True); time.sleep(5)"
+    executor = SubprocessExecutor(timeout=0.5)
+
+    result = executor.run(_python_cmd(code), stream_callback=lambda _chunk: None)
+
+    assert result.timed_out is True
+    assert result.stdout == "partial\n"
+    assert result.chunks == ["partial\n"]
+
+
+def test_run_large_stdin_interleaves_with_output():
+    # The child echoes input as it reads, so writing all stdin before reading
+    # stdout would fill both pipe buffers and deadlock.
+    code = "import sys\nfor line in sys.stdin:\n    sys.stdout.write(line)"
+    prompt = "x" * 99 + "\n"
+    prompt *= 20_000
+    executor = SubprocessExecutor(timeout=10.0)
+
+    result = executor.run(_python_cmd(code), stdin=prompt)
+    streamed = executor.run(_python_cmd(code), stdin=prompt, stream_callback=lambda _c: None)
+
+    assert result.timed_out is False
+    assert result.stdout == prompt
+    assert streamed.timed_out is False
+    assert streamed.stdout == prompt
+
+
+def test_run_detects_exit_without_pidfd(monkeypatch):
+    monkeypatch.setattr(executor_module, "_open_pidfd", lambda _pid: None)
+    executor = SubprocessExecutor(timeout=2.0)
+
+    result = executor.run(_python_cmd("print('done')"), stream_callback=lambda _chunk: None)
+
+    assert result.exit_code == 0
+    assert result.stdout == "done\n"
+
+
+def test_run_stops_at_exit_when_descendant_holds_pipes():
+    # The grandchild inherits stdout, so EOF never arrives before the timeout;
+    # only the exit notification ends the loop.
+    code = (
+        "import subprocess,sys; "
+        "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(3)']); "
+        "print('parent done', flush=True)"
+    )
+    executor = SubprocessExecutor(timeout=5.0)
+
+    result = executor.run(_python_cmd(code), stream_callback=lambda _chunk: None)
+
+    assert result.timed_out is False
+    assert result.stdout == "parent done\n"
+    assert result.wall_time_ms < 2500
+
+
+def test_run_timeout_applies_after_child_closes_pipes():
+    code = "import os,time; os.close(1); os.close(2); time.sleep(5)"
+    executor = SubprocessExecutor(timeout=0.5)
+
+    for stream_callback in (None, lambda _chunk: None):
+        result = executor.run(_python_cmd(code), stream_callback=stream_callback)
+
+        assert result.timed_out is True
+        assert result.exit_code != 0
+        assert result.wall_time_ms < 4000
+
+
+def test_run_kills_process_exceeding_output_limit():
+    code = "import sys\nwhile True:\n    sys.stdout.write('x' * 4096)"
+    executor = SubprocessExecutor(timeout=5.0, max_output_bytes=256 * 1024)
+
+    result = executor.run(_python_cmd(code))
+    streamed = executor.run(_python_cmd(code), stream_callback=lambda _chunk: None)
+
+    for res in (result, streamed):
+        assert res.output_limit_exceeded is True
+        assert res.timed_out is False
+        assert res.exit_code != 0
+        assert "Output limit exceeded" in res.stderr
+        assert len(res.stdout) < 2 * 256 * 1024
+
+
+def test_run_output_limit_flushes_partial_line_to_callback():
+    code = "import sys\nwhile True:\n    sys.stdout.write('x' * 4096)"
+    executor = SubprocessExecutor(timeout=5.0, max_output_bytes=64 * 1024)
+    received: list[str] = []
+
+    result = executor.run(_python_cmd(code), stream_callback=received.append)
+
+    assert result.output_limit_exceeded is True
+    assert result.stdout
+    assert "".join(received) == result.stdout
+
+
+def test_executor_has_no_output_limit_by_default():
+    assert SubprocessExecutor().max_output_bytes is None
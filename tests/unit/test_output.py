@@ -0,0 +1,35 @@
+"""Tests for CLI JSON output helpers."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from mrbench.cli import _output as output_module
+from mrbench.cli._output import emit_json, write_json_file
+
+PAYLOAD = {"run_id": "abc", "jobs": [{"ttft_ms": 0.0, "error": None}], "note": "naïve"}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def json_backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(output_module, "_orjson", lambda: None)
+    return str(request.param)
+
+
+def test_emit_json_round_trips(json_backend: str, capsys: pytest.CaptureFixture[str]) -> None:
+    emit_json(PAYLOAD)
+    out = capsys.readouterr().out
+    assert out.endswith("}\n")
+    assert json.loads(out) == PAYLOAD
+
+
+def test_write_json_file_round_trips(json_backend: str, tmp_path: Path) -> None:
+    path = tmp_path / "run_meta.json"
+    write_json_file(path, PAYLOAD)
+    assert json.loads(path.read_text(encoding="utf-8")) == PAYLOAD
@@ -2,10 +2,29 @@
 
 import pytest
 
+from mrbench.adapters.base import AdapterCapabilities
 from mrbench.adapters.fake import FakeAdapter
 from mrbench.core.router import Router, RoutingConstraints, RoutingPolicy
 
 
+class _NamedFakeAdapter(FakeAdapter):
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+
+class _CountingFakeAdapter(FakeAdapter):
+    def __init__(self) -> None:
+        self.capability_calls = 0
+
+    def get_capabilities(self) -> AdapterCapabilities:
+        self.capability_calls += 1
+        return super().get_capabilities()
+
+
 @pytest.fixture
 def router() -> Router:
     return Router()
@@ -72,3 +91,22 @@ def test_router_default_models():
 
     assert result is not None
     assert result.model == "fake-fast"
+
+
+def test_router_sorts_by_preference_and_ranks_unknown_last():
+    router = Router(preference_order=["second", "first"])
+
+    result = router.route([FakeAdapter(), _NamedFakeAdapter("first"), _NamedFakeAdapter("second")])
+
+    assert result is not None
+    assert result.provider == "second"
+    assert result.alternatives == ["first", "fake"]
+
+
+def test_router_queries_capabilities_once_per_adapter(offline_router: Router):
+    adapter = _CountingFakeAdapter()
+
+    result = offline_router.route([adapter])
+
+    assert result is not None
+    assert adapter.capability_calls == 1
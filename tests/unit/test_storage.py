@@ -1,18 +1,21 @@
 """Test SQLite storage layer."""
 
+import dataclasses
+import json
+import sqlite3
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
 
-from mrbench.core.storage import Storage, hash_prompt
+from mrbench.core import storage as storage_module
+from mrbench.core.storage import Storage, hash_prompt, hash_prompt_bytes
 
 
 @pytest.fixture
-def storage(tmp_path: Path) -> Storage:
-    db_path = tmp_path / "test.db"
-    instance = Storage(db_path)
-    yield instance
-    instance.close()
+def storage(fast_storage: Storage) -> Storage:
+    return fast_storage
 
 
 def test_storage_creates_tables(storage: Storage):
@@ -23,6 +26,20 @@ def test_storage_creates_tables(storage: Storage):
     assert "capabilities" in tables
 
 
+def test_schema_version_recorded_and_script_skipped_on_reopen(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    db_path = tmp_path / "schema.db"
+    with Storage(db_path) as first:
+        with first._read() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+        assert version == storage_module.SCHEMA_VERSION
+
+    monkeypatch.setattr(storage_module, "SCHEMA", "this is not sql;")
+    with Storage(db_path) as reopened:
+        assert "runs" in reopened.list_tables()
+
+
 def test_create_run(storage: Storage):
     run = storage.create_run(suite_path="suites/basic.yaml")
     assert run.id is not None
@@ -53,6 +70,286 @@ def test_add_metric(storage: Storage):
     assert metrics[0].metric_value == 1234.5
 
 
+def test_add_metrics_inserts_batch(storage: Storage):
+    run = storage.create_run()
+    job = storage.create_job(run.id, "ollama", "llama3.2", "hash")
+    storage.add_metrics(
+        job.id,
+        [
+            ("wall_time_ms", 1234.5, "ms", False),
+            ("output_tokens", 42, "tokens", True),
+        ],
+    )
+
+    metrics = {m.metric_name: m for m in storage.get_job_metrics(job.id)}
+    assert metrics["wall_time_ms"].metric_value == 1234.5
+    assert metrics["output_tokens"].metric_value == 42
+    assert metrics["output_tokens"].is_estimated is True
+    assert metrics["wall_time_ms"].is_estimated is False
+
+
+def test_add_metrics_empty_is_noop(storage: Storage):
+    run = storage.create_run()
+    job = storage.create_job(run.id, "ollama", "llama3.2", "hash")
+    storage.add_metrics(job.id, [])
+    assert storage.get_job_metrics(job.id) == []
+
+
+def test_transaction_commits_once_on_exit(tmp_path: Path):
+    db_path = tmp_path / "tx.db"
+    with Storage(db_path) as storage:
+        run = storage.create_run()
+        with storage.transaction():
+            job = storage.create_job(run.id, "ollama", "llama3.2", "hash")
+            storage.start_job(job.id)
+            # Not yet visible to other connections
+            with Storage(db_path) as other:
+                assert other.get_job(job.id) is None
+            storage.complete_job(job.id, exit_code=0)
+            storage.add_metrics(job.id, [("wall_time_ms", 1.0, "ms", False)])
+
+        with Storage(db_path) as other:
+            saved = other.get_job(job.id)
+            assert saved is not None
+            assert saved.status == "completed"
+            assert len(other.get_job_metrics(job.id)) == 1
+
+
+def test_transaction_rolls_back_on_error(storage: Storage):
+    run = storage.create_run()
+    with pytest.raises(RuntimeError), storage.transaction():
+        job = storage.create_job(run.id, "ollama", "llama3.2", "hash")
+        raise RuntimeError("boom")
+
+    assert storage.get_job(job.id) is None
+    # Subsequent writes still commit normally
+    storage.complete_run(run.id)
+    assert storage.get_run(run.id).status == "completed"
+
+
+def test_transaction_rolls_back_when_commit_fails(tmp_db: Path):
+    with Storage(tmp_db) as storage:
+        writer = storage._get_writer()
+        writer.execute("PRAGMA foreign_keys=ON")
+        # A deferred foreign key violation only surfaces at COMMIT
+        with pytest.raises(sqlite3.IntegrityError), storage.transaction():
+            writer.execute("PRAGMA defer_foreign_keys=ON")
+            job = storage.create_job("missing-run", "ollama", "llama3.2", "hash")
+
+        assert not writer.in_transaction
+        assert storage.get_job(job.id) is None
+        # Subsequent writes still commit normally
+        run = storage.create_run()
+        assert storage.get_run(run.id) is not None
+
+
+def test_nested_transaction_joins_outer(storage: Storage):
+    run = storage.create_run()
+    with pytest.raises(RuntimeError), storage.transaction():
+        with storage.transaction():
+            job = storage.create_job(run.id, "ollama", "llama3.2", "hash")
+        raise RuntimeError("boom")
+
+    assert storage.get_job(job.id) is None
+
+
+def test_generated_ids_are_uuid7_and_time_ordered():
+    ids = [storage_module._generate_id() for _ in range(3)]
+    parsed = [uuid.UUID(value) for value in ids]
+    assert all(str(u) == value for u, value in zip(parsed, ids, strict=True))
+    assert all(u.version == 7 and u.variant == uuid.RFC_4122 for u in parsed)
+    assert [value[:13] for value in ids] == sorted(value[:13] for value in ids)
+
+
+def test_metrics_lookup_by_job_uses_index(storage: Storage):
+    with storage._read() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM metrics WHERE job_id = ?",
+            ("job",),
+        ).fetchall()
+    assert "idx_metrics_job_name" in plan[0]["detail"]
+
+
+def test_get_jobs_for_run_order_uses_index(storage: Storage):
+    with storage._read() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM jobs WHERE run_id = ? ORDER BY created_at",
+            ("run",),
+        ).fetchall()
+    details = " ".join(row["detail"] for row in plan)
+    assert "idx_jobs_run_created" in details
+    assert "TEMP B-TREE" not in details
+
+
+@pytest.mark.parametrize(
+    ("columns", "model"),
+    [
+        (storage_module._RUN_COLUMNS, storage_module.Run),
+        (storage_module._JOB_COLUMNS, storage_module.Job),
+        (storage_module._METRIC_COLUMNS, storage_module.Metric),
+    ],
+)
+def test_select_columns_match_dataclass_field_order(columns: str, model: type):
+    names = [name.strip() for name in columns.split(",")]
+    assert names == [f.name for f in dataclasses.fields(model)]
+
+
+def test_row_factories_restore_bool_fields(storage: Storage):
+    run = storage.create_run()
+    job = storage.create_job(run.id, "ollama", "llama3.2", "hash")
+    storage.add_metric(job.id, "output_tokens", 5, "tokens", is_estimated=True)
+
+    fetched = storage.get_job(job.id)
+    assert fetched is not None
+    assert fetched.prompt_stored is False
+    assert storage.get_job_metrics(job.id)[0].is_estimated is True
+    assert not hasattr(fetched, "__dict__")
+
+
+def test_create_job_skips_redaction_for_safe_preview(
+    storage: Storage, monkeypatch: pytest.MonkeyPatch
+):
+    def fail(text: str) -> str:
+        raise AssertionError("redaction should have been skipped")
+
+    monkeypatch.setattr(storage_module, "redact_secrets", fail)
+    run = storage.create_run()
+    job = storage.create_job(run.id, "ollama", "llama3.2", "hash", prompt_preview="What is 2+2?")
+    storage.complete_job(job.id, exit_code=1, error_message="model not found")
+    saved = storage.get_job(job.id)
+    assert saved is not None
+    assert saved.prompt_preview == "What is 2+2?"
+    assert saved.error_message == "model not found"
+
+
+def test_get_jobs_with_metrics_groups_join_rows(storage: Storage):
+    run = storage.create_run()
+    first = storage.create_job(run.id, "ollama", "llama3.2", "hash-a")
+    second = storage.create_job(run.id, "claude", "sonnet", "hash-b")
+    storage.add_metrics(
+        first.id,
+        [("wall_time_ms", 10.0, "ms", False), ("output_tokens", 4, "tokens", True)],
+    )
+    other_run = storage.create_run()
+    storage.create_job(other_run.id, "ollama", "llama3.2", "hash-c")
+
+    loaded = storage.get_jobs_with_metrics(run.id)
+
+    assert [job.id for job, _ in loaded] == [first.id, second.id]
+    first_metrics = loaded[0][1]
+    assert [m.metric_name for m in first_metrics] == ["wall_time_ms", "output_tokens"]
+    assert first_metrics[1].is_estimated is True
+    assert all(m.job_id == first.id for m in first_metrics)
+    assert loaded[1][1] == []
+
+
+def test_create_job_stores_hex_prompt_hash_as_blob(storage: Storage):
+    run = storage.create_run()
+    digest = hash_prompt("What is 2+2?")
+    job = storage.create_job(run.id, "ollama", "llama3.2", digest)
+    other = storage.create_job(run.id, "ollama", "llama3.2", "not-a-digest")
+
+    assert job.prompt_hash == digest
+    assert storage.get_job(job.id).prompt_hash == digest
+    assert storage.get_job(other.id).prompt_hash == "not-a-digest"
+    with storage._read() as conn:
+        kinds = dict(conn.execute("SELECT id, typeof(prompt_hash) FROM jobs").fetchall())
+    assert kinds == {job.id: "blob", other.id: "text"}
+
+
+def test_reopen_migrates_hex_prompt_hashes(tmp_path: Path):
+    db_path = tmp_path / "legacy.db"
+    with Storage(db_path) as storage:
+        run = storage.create_run()
+        job = storage.create_job(run.id, "ollama", "llama3.2", "placeholder")
+        with storage._write() as cursor:
+            cursor.execute(
+                "UPDATE jobs SET prompt_hash = ? WHERE id = ?", (hash_prompt("hi"), job.id)
+            )
+            cursor.execute("PRAGMA user_version = 1")
+
+    with Storage(db_path) as reopened:
+        saved = reopened.get_job(job.id)
+        assert saved is not None
+        assert saved.prompt_hash == hash_prompt("hi")
+        with reopened._read() as conn:
+            kind = conn.execute("SELECT typeof(prompt_hash) FROM jobs").fetchone()[0]
+        assert kind == "blob"
+
+
+def test_count_jobs_and_metrics(storage: Storage):
+    run = storage.create_run()
+    assert storage.count_jobs_for_run(run.id) == 0
+    first = storage.create_job(run.id, "ollama", "llama3.2", "hash-a")
+    storage.create_job(run.id, "ollama", "llama3.2", "hash-b")
+    storage.add_metrics(
+        first.id,
+        [("wall_time_ms", 1.0, "ms", False), ("ttft_ms", 0.5, "ms", False)],
+    )
+
+    assert storage.count_jobs_for_run(run.id) == 2
+    assert storage.count_metrics_for_job(first.id) == 2
+    assert storage.count_jobs_for_run("missing") == 0
+
+
+def test_long_fields_are_stored_compressed(storage: Storage):
+    snapshot = {"prompts": ["x" * 2000]}
+    run = storage.create_run(config_snapshot=snapshot)
+    job = storage.create_job(run.id, "ollama", "llama3.2", "hash")
+    error = "traceback line\n" * 200
+    storage.complete_job(job.id, exit_code=1, error_message=error)
+
+    with storage._read() as conn:
+        raw = conn.execute("SELECT config_snapshot FROM runs").fetchone()[0]
+        raw_error = conn.execute("SELECT error_message FROM jobs").fetchone()[0]
+    assert isinstance(raw, bytes) and len(raw) < 2000
+    assert isinstance(raw_error, bytes) and len(raw_error) < len(error)
+
+    saved_run = storage.get_run(run.id)
+    assert saved_run is not None
+    assert json.loads(saved_run.config_snapshot or "") == snapshot
+    saved_job = storage.get_job(job.id)
+    assert saved_job is not None
+    assert saved_job.error_message == error
+
+
+def test_short_fields_stay_plain_text(storage: Storage):
+    run = storage.create_run()
+    job = storage.create_job(run.id, "ollama", "llama3.2", "hash")
+    storage.complete_job(job.id, exit_code=1, error_message="model not found")
+    with storage._read() as conn:
+        kind = conn.execute("SELECT typeof(error_message) FROM jobs").fetchone()[0]
+    assert kind == "text"
+
+
+def test_compression_falls_back_to_zlib(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(storage_module, "_zstd", lambda: None)
+    text = "features " * 500
+    packed = storage_module._maybe_compress(text)
+    assert isinstance(packed, bytes) and packed.startswith(b"zlib")
+    assert storage_module._maybe_decompress(packed) == text
+
+
+def test_large_capability_features_round_trip(storage: Storage):
+    features = {f"flag_{i}": True for i in range(200)}
+    storage.save_capabilities("ollama", "/usr/bin/ollama", features=features)
+    assert storage.get_capabilities()[0].features == features
+
+
+def test_writes_share_one_cursor(storage: Storage):
+    with storage._write() as first:
+        pass
+    run = storage.create_run()
+    job = storage.create_job(run.id, "ollama", "llama3.2", "hash")
+    metric = storage.add_metric(job.id, "wall_time_ms", 1.0, "ms")
+    storage.save_capabilities("ollama", "/usr/bin/ollama")
+    with storage._write() as second:
+        assert second is first
+    assert metric.id > 0
+    # The RETURNING upsert must not leave the write transaction open
+    assert storage._get_writer().in_transaction is False
+
+
 def test_hash_prompt():
     prompt = "What is 2 + 2?"
     h = hash_prompt(prompt)
@@ -60,6 +357,15 @@ def test_hash_prompt():
     assert hash_prompt(prompt) == h  # Deterministic
 
 
+def test_hash_prompt_accepts_bytes_like():
+    prompt = "Résumé the text"
+    encoded = prompt.encode()
+    assert hash_prompt(encoded) == hash_prompt(prompt)
+    assert hash_prompt(memoryview(encoded)) == hash_prompt(prompt)
+    assert hash_prompt_bytes(prompt) == bytes.fromhex(hash_prompt(prompt))
+    assert len(hash_prompt_bytes(prompt)) == 32
+
+
 def test_complete_run(storage: Storage):
     run = storage.create_run()
     storage.complete_run(run.id, "completed")
@@ -92,9 +398,9 @@ def test_storage_context_manager_closes_connection(tmp_path: Path):
     with Storage(db_path) as managed:
         tables = managed.list_tables()
         assert "runs" in tables
-        assert managed._conn is not None
+        assert managed._writer is not None
 
-    assert managed._conn is None
+    assert managed._writer is None
 
 
 def test_get_run_missing_returns_none(storage: Storage):
@@ -174,3 +480,99 @@ def test_save_capabilities_defaults_models_and_features(storage: Storage):
 
     assert saved.models == []
     assert saved.features == {}
+
+
+def test_storage_applies_tuned_pragmas_by_default(tmp_db: Path):
+    with Storage(tmp_db) as storage:
+        conn = storage._get_writer()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+
+def test_stats_reports_page_and_mmap_settings(storage: Storage):
+    stats = storage.stats()
+    assert stats["page_size"] == 8192
+    assert stats["mmap_size"] == 256 << 20
+    assert stats["journal_mode"] == "wal"
+    assert int(stats["page_count"]) > 0
+
+
+def test_storage_pragmas_can_be_disabled(tmp_path: Path):
+    with Storage(tmp_path / "plain.db", pragmas={}) as plain:
+        conn = plain._get_writer()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+
+def test_reader_connections_are_query_only(storage: Storage):
+    with storage._read() as conn:
+        assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM runs")
+
+
+def test_reader_pool_reuses_connections(tmp_path: Path):
+    with Storage(tmp_path / "pool.db", max_readers=2) as storage:
+        run = storage.create_run()
+        for _ in range(5):
+            assert storage.get_run(run.id) is not None
+        assert len(storage._reader_conns) == 1
+
+        with storage._read() as first, storage._read() as second:
+            assert first is not second
+        assert len(storage._reader_conns) == 2
+
+
+def test_reads_from_multiple_threads(storage: Storage):
+    run = storage.create_run()
+    job = storage.create_job(run.id, "ollama", "llama3.2", "hash")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        jobs = list(pool.map(lambda _: storage.get_job(job.id), range(16)))
+
+    assert all(found is not None and found.id == job.id for found in jobs)
+
+
+def test_get_capabilities_reuses_decoded_rows(storage: Storage, monkeypatch: pytest.MonkeyPatch):
+    storage.save_capabilities("ollama", "/usr/bin/ollama", models=["llama3.2"])
+    assert storage.get_capabilities()[0].models == ["llama3.2"]
+
+    loads_calls = 0
+    real_loads = storage_module.json.loads
+
+    def counting_loads(data: str) -> object:
+        nonlocal loads_calls
+        loads_calls += 1
+        return real_loads(data)
+
+    monkeypatch.setattr(storage_module.json, "loads", counting_loads)
+    cached = storage.get_capabilities()
+    assert cached[0].models == ["llama3.2"]
+    assert loads_calls == 0
+
+    # Callers get their own containers
+    cached[0].models.append("mutated")
+    assert storage.get_capabilities()[0].models == ["llama3.2"]
+
+
+def test_save_capabilities_returns_inputs_without_decoding(
+    storage: Storage, monkeypatch: pytest.MonkeyPatch
+):
+    def fail(data: str) -> object:
+        raise AssertionError("save_capabilities should not decode its own JSON")
+
+    monkeypatch.setattr(storage_module.json, "loads", fail)
+    features = {"streaming": True, "limits": {"context": 8192}}
+    saved = storage.save_capabilities(
+        "ollama", "/usr/bin/ollama", models=["llama3.2"], features=features
+    )
+
+    assert saved.models == ["llama3.2"]
+    assert saved.features == features
+
+
+def test_save_capabilities_invalidates_cached_entry(storage: Storage):
+    storage.save_capabilities("ollama", "/usr/bin/ollama", models=["llama3.2"])
+    storage.get_capabilities()
+
+    storage.save_capabilities("ollama", "/usr/bin/ollama", models=["qwen2.5"])
+    assert storage.get_capabilities("ollama")[0].models == ["qwen2.5"]